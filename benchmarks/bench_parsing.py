@@ -0,0 +1,89 @@
+"""Listing parse benchmark: full trees vs card-only strained trees vs selectolax.
+
+    python benchmarks/bench_parsing.py [--cards 3000] [--repeat 3]
+
+Every mode must extract the same records; the script stops if one differs.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixture_pages import build_listing  # noqa: E402
+from scraper_core.parsing import CardStrainer, available_backends, parse_html  # noqa: E402
+
+
+SITES = {
+    'laptopengine': {
+        'card': ('div', 'electron-loop-product'),
+        'selector': 'div.electron-loop-product',
+        'title': 'h6.product-name a',
+        'price': '.price-item--sale',
+    },
+    'revibe': {
+        'card': ('div', 'product-item'),
+        'selector': 'div.product-item',
+        'title': 'a.card-title',
+        'price': '.price-item--sale',
+    },
+}
+
+
+def extract(root, site):
+    records = []
+    for card in root.select(site['selector']):
+        title = card.select_one(site['title'])
+        price = card.select_one(site['price'])
+        records.append((title.text(), title.attr('href'), price.text() if price else None))
+    return records
+
+
+def modes(site):
+    strainer = CardStrainer(*site['card'])
+    result = [('html.parser full', 'html.parser', None)]
+    if 'lxml' in available_backends():
+        result.append(('lxml full', 'lxml', None))
+    result.append(('html.parser + strainer', 'html.parser', strainer))
+    if 'lxml' in available_backends():
+        result.append(('lxml + strainer', 'lxml', strainer))
+    if 'selectolax' in available_backends():
+        result.append(('selectolax', 'selectolax', None))
+    return result
+
+
+def run(site_name, cards, repeat):
+    site = SITES[site_name]
+    html = build_listing(site_name, cards)
+    print(f"\n{site_name}: {cards} cards, {len(html) / 1024 / 1024:.1f} MB")
+
+    expected = None
+    baseline = None
+    for label, backend, strainer in modes(site):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            records = extract(parse_html(html, backend, only=strainer), site)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        if expected is None:
+            expected = records
+        elif records != expected:
+            sys.exit(f"{label} extracted different records than html.parser")
+        baseline = baseline or best
+        print(f"  {label:<24} {best * 1000:8.1f} ms  {baseline / best:5.1f}x  ({len(records)} records)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cards', type=int, default=3000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--site', choices=sorted(SITES), action='append')
+    args = parser.parse_args()
+    for site_name in args.site or sorted(SITES):
+        run(site_name, args.cards, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+"""End-to-end scrape benchmark against the local fixture shop (no network needed).
+
+    python benchmarks/bench_scrape.py [--products 300] [--latency 0.02] [--mode revibe-http] [--parser lxml]
+
+Every fetch mode in MODES runs once per parse backend against
+benchmarks/fixture_server.py, each time in a fresh temporary directory, so
+no cache, checkpoint or change-tracking state carries over. Reported per
+run: rows scraped, wall time, items/sec, the tracemalloc peak (measured in
+a separate pass, since tracing slows everything down) and the time spent
+per stage (scraper_core.instrument spans).
+
+Results are appended to benchmarks/results/history.jsonl together with the
+git revision. Each run is compared with the last recorded run of the same
+configuration from another revision; a drop in throughput or a rise in
+memory beyond --threshold is reported as a regression.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# The Django app's async scraper (products.scraper) is benchmarked as is
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ui-scraper', 'scraper_project'))
+
+from benchmarks.fixture_server import FixtureSite  # noqa: E402
+from scraper_core import instrument  # noqa: E402
+from scraper_core.async_http import AsyncFetcher  # noqa: E402
+from scraper_core.browser_pool import DEFAULT_CHROMEDRIVER_PATH, close_all_pools  # noqa: E402
+from scraper_core.engine import CategoryScraper  # noqa: E402
+from scraper_core.parsing import available_backends  # noqa: E402
+from scraper_core.profiles import LAPTOPENGINE, REVIBE  # noqa: E402
+from products.scraper import ascrape_revibe_products  # noqa: E402
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RESULTS = os.path.join(REPO_DIR, 'benchmarks', 'results', 'history.jsonl')
+# Runs are only compared with runs of the same configuration
+CONFIG_KEYS = ('mode', 'parser', 'products', 'latency', 'concurrency')
+
+
+def bench_profile(base, site, listing=None, detail=None):
+    """`base` pointed at the fixture server, with optional listing/detail overrides."""
+    return dict(
+        base,
+        name=f"bench-{base['name']}",
+        domains=['127.0.0.1'],
+        base_url=site.url,
+        listing=dict(base['listing'], **(listing or {})),
+        detail=dict(base['detail'], **(detail or {})),
+    )
+
+
+# ✅ Fetch modes
+def run_engine(site, options, listing, base, listing_mode=None, detail_mode=None):
+    """CategoryScraper end to end: listing, threaded detail pages, streamed CSV."""
+    profile = bench_profile(base, site,
+                            listing={'mode': listing_mode} if listing_mode else None,
+                            detail={'mode': detail_mode} if detail_mode else None)
+    scraper = CategoryScraper(
+        site.listing_url(listing), profile,
+        output_path='products.csv',
+        concurrency=options['concurrency'],
+        max_per_host=options['concurrency'],
+        min_interval=0,
+        chromedriver_path=options['chromedriver'],
+        timings=False,
+        log=None,
+    )
+    scraper.run()
+    return scraper.rows_written
+
+
+def run_async(site, options):
+    """products.scraper.ascrape_revibe_products (the Django app's async scrape) against the fixture shop."""
+    return asyncio.run(scrape_async(site, options['concurrency']))
+
+
+async def scrape_async(site, concurrency):
+    # No rate limit, like the engine modes run with min_interval=0
+    async with AsyncFetcher(concurrency=concurrency, max_per_host=concurrency, rate=0) as fetcher:
+        _, rows = await ascrape_revibe_products(
+            'products.csv', url=site.listing_url('revibe'), profile=bench_profile(REVIBE, site), fetcher=fetcher,
+        )
+    return len(rows)
+
+
+MODES = {
+    'revibe-http': (
+        "?page=N listing + threaded HTTP detail pages",
+        lambda site, options: run_engine(site, options, 'revibe', REVIBE)),
+    'revibe-products-json': (
+        "listing without cards in the HTML, read from /products.json instead",
+        lambda site, options: run_engine(site, options, 'revibe-app', REVIBE)),
+    'revibe-async': (
+        "ascrape_revibe_products: ?page=N listing + aiohttp detail pages",
+        run_async),
+    'laptopengine-http': (
+        "laptopengine pages, listing and details over plain HTTP",
+        lambda site, options: run_engine(site, options, 'laptopengine', LAPTOPENGINE, 'http', 'http')),
+    'laptopengine-browser': (
+        "real profile: Chrome clicks \"Load More\" and renders detail pages (needs --browser)",
+        lambda site, options: run_engine(site, options, 'laptopengine', LAPTOPENGINE)),
+}
+BROWSER_MODES = ('laptopengine-browser',)
+
+
+# ✅ Measuring
+def run_once(mode, site, options, trace_memory=False):
+    """(rows, wall time, stage report, peak MB) of one run in a scratch directory."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='bench-', ignore_cleanup_errors=True) as scratch:
+        os.chdir(scratch)
+        try:
+            if trace_memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+            with instrument.recording('timings.json'):
+                rows = MODES[mode][1](site, options)
+            wall_time = time.perf_counter() - started
+            peak_mb = None
+            if trace_memory:
+                peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                tracemalloc.stop()
+            with open('timings.json', encoding='utf-8') as f:
+                report = json.load(f)
+        finally:
+            os.chdir(cwd)
+    return rows, wall_time, report, peak_mb
+
+
+def measure(mode, parser, site, options):
+    os.environ['SCRAPER_PARSER'] = parser
+    best = None
+    for _ in range(options['repeat']):
+        result = run_once(mode, site, options)
+        if best is None or result[1] < best[1]:
+            best = result
+    rows, wall_time, report, _ = best
+    peak_mb = None if options['no_memory'] else run_once(mode, site, options, trace_memory=True)[3]
+    return {
+        'mode': mode,
+        'parser': parser,
+        'products': options['products'],
+        'latency': options['latency'],
+        'concurrency': options['concurrency'],
+        'rows': rows,
+        'wall_time': round(wall_time, 4),
+        'throughput': round(rows / wall_time, 2) if wall_time else None,
+        'peak_mb': round(peak_mb, 2) if peak_mb is not None else None,
+        'stages': {name: {'count': stage['count'], 'total': stage['total'], 'p95': stage['p95']}
+                   for name, stage in report['stages'].items()},
+    }
+
+
+# ✅ History
+def git_revision():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def previous_run(history, result):
+    """Last recorded run with the same configuration from another revision."""
+    for record in reversed(history):
+        if record['revision'] != result['revision'] and all(record.get(k) == result[k] for k in CONFIG_KEYS):
+            return record
+    return None
+
+
+def compare(result, previous, threshold):
+    """List of regression messages (empty when none) against `previous`."""
+    problems = []
+    if previous.get('throughput') and result['throughput'] is not None:
+        change = result['throughput'] / previous['throughput'] - 1
+        if change < -threshold:
+            problems.append(f"throughput {change:+.0%} ({previous['throughput']} -> {result['throughput']} items/s)")
+    if previous.get('peak_mb') and result['peak_mb'] is not None:
+        change = result['peak_mb'] / previous['peak_mb'] - 1
+        if change > threshold:
+            problems.append(f"memory peak {change:+.0%} ({previous['peak_mb']} -> {result['peak_mb']} MB)")
+    return problems
+
+
+def summary(result):
+    slowest = sorted(result['stages'].items(), key=lambda item: -item[1]['total'])[:3]
+    stages = ', '.join(f"{name} {stage['total']:.2f}s" for name, stage in slowest)
+    peak = f"{result['peak_mb']:7.1f} MB" if result['peak_mb'] is not None else '      - MB'
+    return (f"  {result['mode']:<21} {result['parser']:<12} {result['rows']:>5} rows {result['wall_time']:7.2f} s "
+            f"{result['throughput']:8.1f} items/s {peak}  [{stages}]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=300, help="products per shop")
+    parser.add_argument('--page-size', type=int, default=24, help="cards per listing page / Load More round")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds the server waits before every response")
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--concurrency', type=int, default=4, help="detail pages in flight")
+    parser.add_argument('--repeat', type=int, default=1, help="timed runs per configuration, the fastest counts")
+    parser.add_argument('--mode', choices=sorted(MODES), action='append', help="default: every mode")
+    parser.add_argument('--parser', choices=available_backends(), action='append',
+                        help="default: every installed backend")
+    parser.add_argument('--browser', action='store_true', help="include modes that drive Chrome")
+    parser.add_argument('--chromedriver', default=os.environ.get('CHROMEDRIVER_PATH', DEFAULT_CHROMEDRIVER_PATH))
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc pass")
+    parser.add_argument('--results', default=DEFAULT_RESULTS, help="JSON Lines history file")
+    parser.add_argument('--no-save', action='store_true', help="do not append this run to the history")
+    parser.add_argument('--label', help="name for this run in the history (default: git describe)")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative change counted as a regression (default: 0.10)")
+    parser.add_argument('--fail-on-regression', action='store_true', help="exit with 1 when something regressed")
+    args = parser.parse_args()
+
+    modes = args.mode or [mode for mode in MODES if args.browser or mode not in BROWSER_MODES]
+    parsers = args.parser or available_backends()
+    options = {
+        'products': args.products, 'latency': args.latency, 'concurrency': args.concurrency,
+        'repeat': args.repeat, 'no_memory': args.no_memory, 'chromedriver': args.chromedriver,
+    }
+    # Runs must hit the fixture server, never a response cache
+    for name in ('SCRAPER_CACHE', 'SCRAPER_REPLAY', 'SCRAPER_TIMINGS'):
+        os.environ.pop(name, None)
+
+    revision = args.label or git_revision()
+    history = load_history(args.results)
+    meta = {'revision': revision, 'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'platform': platform.platform(terse=True)}
+    results = []
+    regressions = 0
+
+    with FixtureSite(args.products, args.page_size, args.latency, args.jitter) as site:
+        print(f"Fixture shop on {site.url}: {args.products} products, {args.latency * 1000:.0f} ms latency, "
+              f"revision {revision}")
+        try:
+            for mode in modes:
+                print(f"\n{mode}: {MODES[mode][0]}")
+                for parse_backend in parsers:
+                    result = dict(meta, **measure(mode, parse_backend, site, options))
+                    results.append(result)
+                    print(summary(result))
+                    if result['rows'] != args.products:
+                        print(f"    ⚠️ expected {args.products} rows")
+                    previous = previous_run(history, result)
+                    for problem in compare(result, previous, args.threshold) if previous else []:
+                        regressions += 1
+                        print(f"    ❌ regression vs {previous['revision']}: {problem}")
+        finally:
+            close_all_pools()
+
+    if not args.no_save and results:
+        os.makedirs(os.path.dirname(args.results) or '.', exist_ok=True)
+        with open(args.results, 'a', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps(result, ensure_ascii=False) + '\n')
+        print(f"\n{len(results)} results appended to {args.results}")
+    if regressions:
+        print(f"{regressions} regressions (threshold {args.threshold:.0%})")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
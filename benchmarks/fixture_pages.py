@@ -0,0 +1,38 @@
+import os
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def card_values(i):
+    return {'i': i, 'price': 1000 + (i * 37) % 4000, 'regular': 1500 + (i * 37) % 4000}
+
+
+def build_cards(site, count, start=0):
+    """Markup of `count` product cards of `site`, numbered from `start`."""
+    card = read_fixture(f'{site}_card.html')
+    cards = []
+    for i in range(start, start + count):
+        html = card
+        for key, value in card_values(i).items():
+            html = html.replace('{' + key + '}', str(value))
+        cards.append(html)
+    return ''.join(cards)
+
+
+def build_listing(site, count, start=0, next_page=None):
+    """Listing page for `site` ('laptopengine' or 'revibe') with `count` product cards."""
+    page = read_fixture(f'{site}_page.html')
+    pagination = f'<a class="pagination__item--next" href="?page={next_page}">Next</a>' if next_page else ''
+    return (page.replace('{cards}', build_cards(site, count, start))
+                .replace('{next_page}', str(next_page or ''))
+                .replace('{pagination}', pagination))
+
+
+def build_detail(site, i):
+    return read_fixture(f'{site}_detail.html').replace('{i}', str(i))
@@ -0,0 +1,196 @@
+"""Local copy of a laptopengine- and a revibe-style shop, served over HTTP for offline runs.
+
+    python -m benchmarks.fixture_server [--products 500] [--latency 0.05] [--port 8765]
+
+Routes (every page is rendered once at startup from benchmarks/fixtures):
+
+    /product-category/laptops/[?page=N]      laptopengine listing with a "Load More" button
+    /product-category/laptops/more?page=N    the cards "Load More" appends (what the button fetches)
+    /product/refurbished-laptop-<i>/         laptopengine product page
+    /collections/iphones[?page=N]            revibe listing, plain ?page=N pagination
+    /collections/iphones-app                 revibe listing whose cards only exist in JavaScript;
+    /collections/iphones-app/products.json   ... the Shopify endpoint that serves them instead
+    /products/iphone-<i>-renewed             revibe product page
+
+Every response waits `latency` seconds (plus up to `jitter`) first, like a
+remote shop would.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from benchmarks.fixture_pages import build_cards, build_detail, build_listing
+
+
+LAPTOPENGINE_LISTING = '/product-category/laptops/'
+REVIBE_LISTING = '/collections/iphones'
+REVIBE_APP_LISTING = '/collections/iphones-app'
+
+# Clicking "Load More" fetches the next page of cards and appends them, like the WooCommerce theme does
+LOAD_MORE_JS = """
+<script>
+document.addEventListener('click', function (event) {
+  var button = event.target.closest('.electron-load-more');
+  if (!button) return;
+  event.preventDefault();
+  var page = parseInt(button.dataset.page, 10);
+  fetch('%(more_url)s?page=' + page).then(function (response) { return response.text(); }).then(function (html) {
+    document.querySelector('.electron-products').insertAdjacentHTML('beforeend', html);
+    if (page >= %(last_page)d) button.parentNode.remove(); else button.dataset.page = page + 1;
+  });
+});
+</script>
+"""
+
+
+class FixtureSite:
+    """Threaded HTTP server for the fixture shop; use as `with FixtureSite(...) as site:`.
+
+    `products` cards per shop, `page_size` per listing page (and per "Load
+    More" round). `port=0` picks a free port; `site.url` has the address.
+    `site.requests` counts the requests served.
+    """
+
+    def __init__(self, products=500, page_size=24, latency=0.0, jitter=0.0, host='127.0.0.1', port=0):
+        self.products = products
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self.handler_class())
+        self.server.daemon_threads = True
+        self.url = f'http://{host}:{self.server.server_address[1]}'
+        # products.json carries absolute URLs, so pages are rendered once the port is known
+        self.pages = self.render_pages()
+        self._thread = None
+
+    @property
+    def last_page(self):
+        return max(1, -(-self.products // self.page_size))
+
+    def listing_url(self, site):
+        return self.url + {'laptopengine': LAPTOPENGINE_LISTING, 'revibe': REVIBE_LISTING,
+                           'revibe-app': REVIBE_APP_LISTING}[site]
+
+    # ✅ Pages
+    def page_cards(self, page):
+        start = (page - 1) * self.page_size
+        return start, max(0, min(self.page_size, self.products - start))
+
+    def render_pages(self):
+        """{(path, page): (content type, body)} for every URL the shop answers."""
+        pages = {}
+        more_js = LOAD_MORE_JS % {'more_url': LAPTOPENGINE_LISTING + 'more', 'last_page': self.last_page}
+        # One page past the end answers with an empty listing, which is how ?page=N walkers stop
+        for page in range(1, self.last_page + 2):
+            start, count = self.page_cards(page)
+            next_page = page + 1 if page < self.last_page else None
+
+            html = build_listing('laptopengine', count, start, next_page=next_page)
+            if next_page is None:
+                html = html.replace('<div class="electron-load-more-wrapper">', '<div class="electron-load-more-wrapper" hidden>')
+            pages[(LAPTOPENGINE_LISTING, page)] = ('text/html', html.replace('</body>', more_js + '</body>'))
+            pages[(LAPTOPENGINE_LISTING + 'more', page)] = ('text/html', build_cards('laptopengine', count, start))
+            pages[(REVIBE_LISTING, page)] = ('text/html', build_listing('revibe', count, start, next_page=next_page))
+            pages[(REVIBE_APP_LISTING + '/products.json', page)] = ('application/json', json.dumps({
+                'products': [shopify_product(i, self.url) for i in range(start, start + count)],
+            }))
+        pages[(REVIBE_APP_LISTING, 1)] = ('text/html', build_listing('revibe', 0))
+        pages[(REVIBE_APP_LISTING + '.json', 1)] = ('application/json', json.dumps(
+            {'collection': {'title': 'Refurbished iPhones'}}))
+
+        for i in range(self.products):
+            pages[(f'/product/refurbished-laptop-{i}/', 1)] = ('text/html', build_detail('laptopengine', i))
+            pages[(f'/products/iphone-{i}-renewed', 1)] = ('text/html', build_detail('revibe', i))
+        return {key: (content_type, body.encode('utf-8')) for key, (content_type, body) in pages.items()}
+
+    def lookup(self, path, query):
+        try:
+            page = int(query.get('page', 1))
+        except ValueError:
+            page = 1
+        if page > self.last_page + 1:
+            page = self.last_page + 1
+        return self.pages.get((path, page)) or self.pages.get((path, 1))
+
+    # ✅ Server
+    def handler_class(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out as separate writes; without this, keep-alive
+            # connections stall ~40 ms per response on Nagle + delayed ACK
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with site._lock:
+                    site.requests += 1
+                if site.latency or site.jitter:
+                    time.sleep(site.latency + random.uniform(0, site.jitter))
+                parts = urlsplit(self.path)
+                found = site.lookup(parts.path, dict(parse_qsl(parts.query)))
+                content_type, body = found or ('text/html', b'<h1>Not found</h1>')
+                self.send_response(200 if found else 404)
+                self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def shopify_product(i, origin):
+    return {
+        'title': f'iPhone {i} 128GB - Renewed',
+        'handle': f'iphone-{i}-renewed',
+        'images': [{'src': f'{origin}/cdn/shop/files/iphone-{i}.jpg'}],
+        'variants': [{'price': f'{1000 + (i * 37) % 4000}.00'}],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=500)
+    parser.add_argument('--page-size', type=int, default=24)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="up to this many extra seconds, at random")
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    site = FixtureSite(args.products, args.page_size, args.latency, args.jitter, port=args.port)
+    print(f"Serving {args.products} products per shop on {site.url}")
+    for name in ('laptopengine', 'revibe', 'revibe-app'):
+        print(f"  {name:<13} {site.listing_url(name)}")
+    try:
+        site.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site.server.server_close()
+
+
+if __name__ == '__main__':
+    main()
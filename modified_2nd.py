@@ -1,18 +1,23 @@
-import requests
+import argparse
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.webdriver import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
-import pandas as pd
 import time
-import re
 from datetime import datetime
 import random
 import string
 
+from scraper_core.checkpoint import Checkpoint
+from scraper_core.export import open_sink
+from scraper_core.images import best_candidate, is_valid_image_url, normalize_image_url
+from scraper_core.pagination import load_all
+from scraper_core.parsing import make_soup
+
+# ✅ `python modified_2nd.py --resume` continues the last unfinished run instead of starting over
+parser = argparse.ArgumentParser(description="Scrape the laptopengine laptops category to CSV.")
+parser.add_argument('--resume', action='store_true', help="continue the last unfinished run from its checkpoint")
+args = parser.parse_args()
+
 # Path to ChromeDriver
 chromedriver_path = r'C:\Windows\chromedriver\chromedriver.exe'
 
@@ -24,81 +29,75 @@ options.page_load_strategy = 'eager'  # Load pages faster
 # Initialize the browser
 driver = webdriver.Chrome(service=Service(chromedriver_path), options=options)
 
-# Open the target URL
+# Target URL
 url = "https://www.laptopengine.com/product-category/laptops-laptops-computers/"
-driver.get(url)
 
-# Wait for elements to load
-wait = WebDriverWait(driver, 10)
+# Discovered products and finished rows are recorded here, so a crash never costs finished work
+checkpoint = Checkpoint(url, resume=args.resume)
+if args.resume and not checkpoint.resumed:
+    print("Nothing to resume, starting a new run.")
 
-# Function to click "Load More" until all products are loaded
+# Function to click "Load More" until all products are loaded.
+# Waits for the product count to grow instead of sleeping a fixed time.
 def load_all_products():
-    while True:
-        try:
-            # Scroll to the bottom
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-
-            # Find the "Load More" button
-            load_more_button = wait.until(EC.element_to_be_clickable((By.CLASS_NAME, "electron-load-more")))
-            
-            # Click the button
-            driver.execute_script("arguments[0].click();", load_more_button)
-            print("Clicked 'Load More' button...")
-            
-            # Wait for products to load
-            time.sleep(5)
-
-        except Exception:
-            print("All products loaded or 'Load More' button not found.")
-            break  # Exit when button disappears
-
-# Call function to load all products
-load_all_products()
-
-# Get updated page source after loading all products
-soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-# Extract category
-category_tag = soup.find('h2')
-category = category_tag.get_text(separator=" ", strip=True) if category_tag else 'No category available'
-
-# Find all product items
-product_items = soup.find_all('div', class_='electron-loop-product')
-
-# List to store extracted data
-products_data = []
-
-# Function to normalize image URLs
-def normalize_image_url(url):
-    if url.startswith('//'):
-        return f'https:{url}'
-    elif url.startswith('http://'):
-        return url.replace('http://', 'https://')
-    elif not url.startswith(('http://', 'https://')):
-        return f'https://{url}'
-    return url
-
-# Function to check valid image URL
-def is_valid_image_url(url):
-    return bool(re.match(r'^(https?://)', url))
-
-# Loop through each product item and extract details
-for product in product_items:
-    title_tag = product.find('h6', class_='product-name')
-    link_tag = title_tag.find('a') if title_tag else None
-
-    product_link = link_tag['href'] if link_tag and link_tag.has_attr('href') else 'No link available'
-    title = link_tag.get_text(strip=True) if link_tag else 'No title available'
-
-    price_tag = product.find('span', class_='price-item--sale')
-    price = price_tag.text.strip() if price_tag else 'No price available'
-
-    # ✅ Fix: Validate and clean product link
-    if product_link.startswith("/"):
-        product_link = f"https://www.laptopengine.com{product_link}"
-    elif not product_link.startswith("http"):
-        product_link = "No link available"
+    load_all(driver, 'div.electron-loop-product', '.electron-load-more')
+
+if checkpoint.listing_done:
+    print("✅ Listing already loaded in the previous run, skipping \"Load More\".")
+else:
+    # Open the target URL and load all products
+    driver.get(url)
+    load_all_products()
+
+    # Get updated page source after loading all products
+    soup = make_soup(driver.page_source)
+
+    # Extract category
+    category_tag = soup.find('h2')
+    checkpoint.set_category(category_tag.get_text(separator=" ", strip=True) if category_tag else 'No category available')
+
+    # Find all product items and record them in the checkpoint
+    product_items = soup.find_all('div', class_='electron-loop-product')
+    for position, product in enumerate(product_items):
+        title_tag = product.find('h6', class_='product-name')
+        link_tag = title_tag.find('a') if title_tag else None
+
+        product_link = link_tag['href'] if link_tag and link_tag.has_attr('href') else 'No link available'
+        title = link_tag.get_text(strip=True) if link_tag else 'No title available'
+
+        # ✅ Fix: Validate and clean product link
+        if product_link.startswith("/"):
+            product_link = f"https://www.laptopengine.com{product_link}"
+        elif not product_link.startswith("http"):
+            product_link = "No link available"
+
+        key = product_link if product_link != 'No link available' else f'no-link:{position}'
+        checkpoint.add(key, title, product_link)
+    checkpoint.mark_listing_done()
+
+category = checkpoint.category
+
+# Generate CSV filename (a resumed run keeps writing the same file)
+csv_filename = checkpoint.output_path
+if not csv_filename:
+    current_date = datetime.now().strftime('%Y-%m-%d')
+    random_string = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
+    csv_filename = f'product_list_{current_date}_{random_string}.csv'
+    checkpoint.set_output(csv_filename)
+
+# Rows are written as they are scraped, a crash keeps everything up to it in <csv_filename>.part
+sink = open_sink(csv_filename)
+
+# Rows finished before a resume come from the checkpoint, not from the site
+products = checkpoint.products()
+pending = sum(1 for product in products if product[3] is None)
+print(f"{len(products) - pending} products already done, {pending} to scrape.")
+
+# Loop through each product in listing order and extract the details still to do
+for key, title, product_link, done_row in products:
+    if done_row is not None:
+        sink.write(done_row)
+        continue
 
     # ✅ Fix: Handle timeout errors when opening product pages
     if product_link != 'No link available':
@@ -113,44 +112,46 @@ for product in product_items:
             slider_divs = product_soup.find_all('div', class_='swiper-slide')
             for slider_div in slider_divs:
                 img_tag = slider_div.find('img')
-                if img_tag and img_tag.has_attr('src'):
-                    image_url = img_tag['src']
-                    if is_valid_image_url(image_url):
+                if img_tag:
+                    # Largest srcset candidate when there is one; data: placeholders are not valid
+                    image_url = best_candidate(img_tag.get('srcset') or img_tag.get('src'))
+                    if is_valid_image_url(image_url) and normalize_image_url(image_url) not in slider_images:
                         slider_images.append(normalize_image_url(image_url))
 
             desc_tag = product_soup.find('div', class_='product-desc-content')
             description = desc_tag.get_text(separator="\n", strip=True) if desc_tag else 'No description available'
 
         except Exception as e:
+            # No placeholder row, the product stays pending and is retried by --resume
             print(f"❌ Error loading {product_link}: {str(e)}")
-            slider_images = ['No image available']
-            description = 'No description available'
+            continue
 
     else:
         slider_images = ['No image available']
         description = 'No description available'
 
-    # Store extracted data
-    products_data.append({
+    # Write extracted data to the CSV
+    row = {
         'Categories': category,
         'Name': title,
         'Images': ", ".join(slider_images) if slider_images else 'No valid images',
         'Description': description,
         'Meta: _scrapped': 'Yes',
-    })
+    }
+    sink.write(row)
+    checkpoint.done(key, row)
 
 # Close the browser
 driver.quit()
 
-# Convert to DataFrame
-df = pd.DataFrame(products_data)
-
-# Generate CSV filename
-current_date = datetime.now().strftime('%Y-%m-%d')
-random_string = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
-csv_filename = f'product_list_{current_date}_{random_string}.csv'
-
-# Export CSV
-df.to_csv(csv_filename, index=False)
+# Move the finished CSV into place
+sink.close()
 
 print(f"✅ Data exported to {csv_filename}")
+
+failed = checkpoint.pending()
+if failed:
+    print(f"⚠️ {len(failed)} product pages failed, run again with --resume to retry only those.")
+    checkpoint.close()
+else:
+    checkpoint.finish()
@@ -4,13 +4,16 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.keys import Keys
 from bs4 import BeautifulSoup
-import pandas as pd
 import time
 import re
 from datetime import datetime
 import random
 import string
 
+from scraper_core.export import open_sink
+from scraper_core.images import best_candidate, normalize_image_url
+from scraper_core.parsing import make_soup
+
 # Path to your ChromeDriver
 chromedriver_path = r'C:\Windows\chromedriver\chromedriver.exe'
 
@@ -37,7 +40,7 @@ while True:
     last_height = new_height
 
 # Once all products are loaded, get the page source
-soup = BeautifulSoup(driver.page_source, 'html.parser')
+soup = make_soup(driver.page_source)
 
 # Extract category
 category_tag = soup.find('h2')
@@ -46,19 +49,13 @@ category = category_tag.get_text(separator=" ", strip=True) if category_tag else
 # Find all product items
 product_items = soup.find_all('div', class_='electron-loop-product')
 
-# List to store extracted data
-products_data = []
-
+# Generate CSV filename
+current_date = datetime.now().strftime('%Y-%m-%d')
+random_string = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
+csv_filename = f'product_list_{current_date}_{random_string}.csv'
 
-# Function to normalize image URLs to HTTPS
-def normalize_image_url(url):
-    if url.startswith('//'):
-        return f'https:{url}'  # Convert protocol-relative URLs to HTTPS
-    elif url.startswith('http://'):
-        return url.replace('http://', 'https://')  # Convert HTTP to HTTPS
-    elif not url.startswith(('http://', 'https://')):
-        return f'https://{url}'  # Add HTTPS if the URL is missing a protocol
-    return url  # Return as-is if already HTTPS
+# Rows are written as they are scraped, a crash keeps everything up to it in <csv_filename>.part
+sink = open_sink(csv_filename)
 
 # Loop through each product item and extract details
 for product in product_items:
@@ -100,11 +97,11 @@ for product in product_items:
         slider_divs = product_soup.find_all('div', class_='swiper-slide')
         for slider_div in slider_divs:
             img_tag = slider_div.find('img')
-            if img_tag and img_tag.has_attr('src'):
-                image_url = img_tag['src']
-                # Normalize the image URL to HTTPS
-                normalized_url = normalize_image_url(image_url)
-                slider_images.append(normalized_url)
+            if img_tag:
+                # Largest srcset candidate when there is one, normalized to HTTPS
+                normalized_url = normalize_image_url(best_candidate(img_tag.get('srcset') or img_tag.get('src')))
+                if normalized_url and normalized_url not in slider_images:
+                    slider_images.append(normalized_url)
 
         # Extract product description
         desc_tag = product_soup.find('div', class_='name')
@@ -113,8 +110,8 @@ for product in product_items:
         slider_images = ['No image available']
         description = 'No description available'
 
-    # Append extracted data to the list
-    products_data.append({
+    # Write extracted data to the CSV
+    sink.write({
         'Categories': category,
         'Name': title,
         'Images': ", ".join(slider_images),  # Store multiple images as a comma-separated string
@@ -126,15 +123,7 @@ for product in product_items:
 # Close the browser
 driver.quit()
 
-# Convert the list of dictionaries to a DataFrame
-df = pd.DataFrame(products_data)
-
-# Generate CSV filename
-current_date = datetime.now().strftime('%Y-%m-%d')
-random_string = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
-csv_filename = f'product_list_{current_date}_{random_string}.csv'
-
-# Export DataFrame to CSV
-df.to_csv(csv_filename, index=False)
+# Move the finished CSV into place
+sink.close()
 
 print(f"Data has been exported to {csv_filename}")
\ No newline at end of file
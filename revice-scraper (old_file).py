@@ -1,8 +1,12 @@
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import time
 
+from scraper_core.export import open_sink
+from scraper_core.http_client import HttpClient
+from scraper_core.images import best_candidate
+from scraper_core.parsing import make_soup
+
 # URL of the main listing page
 url = "https://revibe.me/collections/refurbished-iphones-uae"
 
@@ -11,19 +15,23 @@ headers = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 }
 
+# One keep-alive session (pooled connections, retries with backoff) for all requests
+client = HttpClient(headers=headers)
+
 # Send a GET request to the main listing page
 try:
-    response = requests.get(url, headers=headers)
+    response = client.get(url)
     response.raise_for_status()  # Raise HTTPError for bad responses (4xx and 5xx)
 except requests.exceptions.RequestException as e:
     print(f"Failed to retrieve the main page: {e}")
     exit()
 
-# List to store the extracted data
-products_data = []
+# Rows are streamed to the workbook as they are scraped
+excel_filename = 'refurbished_iphones_with_descriptions.xlsx'
+sink = open_sink(excel_filename)
 
 # Parse the HTML content using BeautifulSoup
-soup = BeautifulSoup(response.content, 'html.parser')
+soup = make_soup(response.content)
 
 # Extract category from the <h2> tag
 category_tag = soup.find('h2')
@@ -41,7 +49,7 @@ for product in product_items:
     # Extract product image
     image_tag = product.find('img', class_='motion-reduce')
     if image_tag:
-        image_url = image_tag.get('data-srcset', '').split(',')[0].strip().split(' ')[0] if 'data-srcset' in image_tag.attrs else image_tag.get('src', 'No image available')
+        image_url = best_candidate(image_tag.get('data-srcset', '')) if 'data-srcset' in image_tag.attrs else image_tag.get('src', 'No image available')
     else:
         image_url = 'No image available'
 
@@ -56,7 +64,7 @@ for product in product_items:
     description = "No description available"
     if product_link != 'No link available':
         try:
-            product_response = requests.get(product_link, headers=headers)
+            product_response = client.get(product_link)
             product_response.raise_for_status()
             product_soup = BeautifulSoup(product_response.content, 'html.parser')
             desc_tag = product_soup.find('div', id='tab-technical-specifications')
@@ -65,8 +73,8 @@ for product in product_items:
         except requests.exceptions.RequestException:
             print(f"Failed to retrieve details for {title}")
 
-    # Append the extracted details to the list, including category
-    products_data.append({
+    # Write the extracted details, including category
+    sink.write({
         'Category': category,
         'Title': title,
         'Image URL': image_url,
@@ -78,11 +86,7 @@ for product in product_items:
     # To prevent overloading the server, sleep for a short time
     time.sleep(2)  # Increased delay to be gentler on the server
 
-# Convert the list of dictionaries to a DataFrame
-df = pd.DataFrame(products_data)
-
-# Export the DataFrame to an Excel file
-excel_filename = 'refurbished_iphones_with_descriptions.xlsx'
-df.to_excel(excel_filename, index=False)
+# Save the workbook and move it into place
+sink.close()
 
 print(f"Data has been exported to {excel_filename}")
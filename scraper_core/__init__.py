@@ -0,0 +1,2 @@
+# Shared building blocks used by the GUI tools, the standalone scripts and the
+# Django app in ui-scraper/.
@@ -0,0 +1,100 @@
+import asyncio
+
+import aiohttp
+
+from .http_client import DEFAULT_HEADERS
+from .response_cache import cache_from_env
+
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AsyncRateLimiter:
+    """Spaces request starts so no more than `rate` begin per second."""
+
+    def __init__(self, rate=5.0):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class AsyncFetcher:
+    """aiohttp counterpart of `HttpClient` for semaphore-bounded fan-out.
+
+    Use as `async with AsyncFetcher() as fetcher:`; `fetch_all` returns
+    results in input order.
+    """
+
+    def __init__(self, concurrency=8, max_per_host=4, rate=5.0, retries=3, backoff_factor=0.5, timeout=20,
+                 cache=None):
+        self.cache = cache if cache is not None else cache_from_env()
+        self.concurrency = concurrency
+        self.max_per_host = max_per_host
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.limiter = AsyncRateLimiter(rate)
+        self.session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.max_per_host)
+        self.session = aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS, timeout=self.timeout)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    async def get(self, url, headers=None):
+        """GET `url` and return (status, headers, body).
+
+        Retries with backoff on 429/5xx and connection errors; other 4xx/5xx
+        responses raise `aiohttp.ClientResponseError`. Served from and
+        saved to the response cache when one is configured.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return cached.status, cached.headers, cached.body
+
+        async with self._semaphore:
+            for attempt in range(self.retries + 1):
+                await self.limiter.wait()
+                try:
+                    async with self.session.get(url, headers=headers) as response:
+                        if response.status in RETRY_STATUSES and attempt < self.retries:
+                            await asyncio.sleep(self.backoff_factor * 2 ** attempt)
+                            continue
+                        response.raise_for_status()
+                        body = await response.read()
+                        if self.cache is not None and response.status == 200:
+                            self.cache.put(url, response.status, response.headers, body)
+                        return response.status, response.headers, body
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if attempt == self.retries:
+                        raise
+                    await asyncio.sleep(self.backoff_factor * 2 ** attempt)
+
+    async def get_bytes(self, url):
+        _, _, body = await self.get(url)
+        return body
+
+    async def fetch_all(self, urls, parse):
+        """Fetch every URL and run `parse(body)` on it; failures become exceptions in the result list."""
+        async def one(url):
+            body = await self.get_bytes(url)
+            return parse(body)
+
+        return await asyncio.gather(*(one(url) for url in urls), return_exceptions=True)
@@ -0,0 +1,212 @@
+import atexit
+import os
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from . import instrument
+
+try:
+    import psutil
+except ImportError:  # memory-based recycling is skipped without psutil
+    psutil = None
+
+
+DEFAULT_CHROMEDRIVER_PATH = r'C:\Windows\chromedriver\chromedriver.exe'
+
+
+def new_chrome_driver(chromedriver_path=DEFAULT_CHROMEDRIVER_PATH, headless=True, page_load_strategy='eager'):
+    options = webdriver.ChromeOptions()
+    options.add_argument("--start-maximized")
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+    options.page_load_strategy = page_load_strategy
+
+    # Fall back to Selenium Manager when the hard-coded Windows path is absent
+    if chromedriver_path and os.path.exists(chromedriver_path):
+        service = Service(chromedriver_path)
+    else:
+        service = Service()
+    return webdriver.Chrome(service=service, options=options)
+
+
+def driver_memory_mb(driver):
+    """Resident memory of chromedriver plus every browser process it spawned."""
+    if psutil is None:
+        return 0
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+        return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+    except Exception:
+        return 0
+
+
+_warned_no_psutil = False
+
+
+def warn_no_psutil():
+    """Say once per process that `max_memory_mb` has no effect without psutil."""
+    global _warned_no_psutil
+    if not _warned_no_psutil:
+        _warned_no_psutil = True
+        warnings.warn("psutil is not installed, browsers are not recycled by memory use "
+                      "(pip install psutil to enable max_memory_mb)", RuntimeWarning, stacklevel=3)
+
+
+class BrowserPool:
+    """Keeps up to `size` warm Chrome drivers and leases them out.
+
+    Drivers are reset between leases and replaced after `max_uses` leases or
+    once their process tree grows past `max_memory_mb`.
+    """
+
+    def __init__(self, size=2, factory=None, max_uses=50, max_memory_mb=1500):
+        self.size = max(1, size)
+        self.factory = factory or new_chrome_driver
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        if max_memory_mb and psutil is None:
+            warn_no_psutil()
+        self._idle = []
+        self._uses = {}
+        self._total = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def resize(self, size):
+        with self._cond:
+            self.size = max(1, size)
+            while self._idle and self._total > self.size:
+                self._discard(self._idle.pop())
+            self._cond.notify_all()
+
+    @contextmanager
+    def lease(self, timeout=None):
+        driver = self._acquire(timeout)
+        healthy = True
+        try:
+            yield driver
+        except Exception:
+            healthy = self._is_alive(driver)
+            raise
+        finally:
+            self._release(driver, healthy)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.pop())
+            self._cond.notify_all()
+
+    def _acquire(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Browser pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._total < self.size:
+                    self._total += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("No browser became available in time")
+                self._cond.wait(remaining)
+
+        # Start Chrome outside the lock so other callers are not blocked on it
+        try:
+            with instrument.span('browser.start'):
+                driver = self.factory()
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def _release(self, driver, healthy):
+        with self._cond:
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+            recycle = (
+                not healthy
+                or self._closed
+                or self._total > self.size
+                or self._uses[id(driver)] >= self.max_uses
+            )
+        if not recycle:
+            recycle = not self._reset(driver) or (
+                self.max_memory_mb and driver_memory_mb(driver) > self.max_memory_mb
+            )
+
+        with self._cond:
+            if recycle:
+                self._discard(driver)
+            else:
+                self._idle.append(driver)
+            self._cond.notify()
+
+    def _discard(self, driver):
+        self._total -= 1
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _reset(driver):
+        try:
+            for handle in driver.window_handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(driver.window_handles[0])
+            driver.delete_all_cookies()
+            driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+            driver.get("about:blank")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(chromedriver_path=DEFAULT_CHROMEDRIVER_PATH, headless=True, size=2, **kwargs):
+    """Process-wide pool for a driver configuration, shared across scrape runs."""
+    key = (chromedriver_path, headless)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            factory = lambda: new_chrome_driver(chromedriver_path, headless=headless)
+            pool = _pools[key] = BrowserPool(size=size, factory=factory, **kwargs)
+        elif pool.size < size:
+            pool.resize(size)
+        return pool
+
+
+@atexit.register
+def close_all_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from .http_client import get_client
+
+
+DEFAULT_STORE_PATH = os.path.join('scrape_cache', 'details.sqlite3')
+
+# Parts of a page that change on every request without the product changing
+VOLATILE_RE = re.compile(rb'<script\b.*?</script>|<!--.*?-->|\s+', re.DOTALL | re.IGNORECASE)
+
+
+def content_hash(body):
+    return hashlib.sha256(VOLATILE_RE.sub(b'', body)).hexdigest()
+
+
+def spec_hash(spec):
+    """Short fingerprint of what decides the extracted payload (e.g. a profile's `detail` section)."""
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+class DetailStore:
+    """SQLite table of validators and extracted data per product URL.
+
+    `spec` records which extraction spec produced the payload, so a payload
+    extracted with other selectors is never handed back as unchanged.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS details ("
+            " url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content_hash TEXT,"
+            " payload TEXT NOT NULL, checked_at REAL NOT NULL, spec TEXT)"
+        )
+        # Stores written before `spec` existed; their rows count as extracted with an unknown spec
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(details)")]
+        if 'spec' not in columns:
+            self._conn.execute("ALTER TABLE details ADD COLUMN spec TEXT")
+        self._conn.commit()
+
+    def get(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, content_hash, payload, spec FROM details WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, digest, payload, spec = row
+        return {'etag': etag, 'last_modified': last_modified, 'content_hash': digest,
+                'payload': json.loads(payload), 'spec': spec}
+
+    def put(self, url, etag, last_modified, digest, payload, spec=None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO details (url, etag, last_modified, content_hash, payload, checked_at, spec)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, digest, json.dumps(payload), time.time(), spec),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ChangeTracker:
+    """Skips re-extracting product pages that have not changed since the last run.
+
+    Requests carry If-None-Match / If-Modified-Since from the previous
+    response. A 304, or a 200 whose body hashes the same as before, means
+    the stored payload (description, images, ...) can be reused as is.
+    `spec` describes how payloads are extracted (e.g. the profile's `detail`
+    section); a payload stored under a different spec counts as changed, so
+    editing a selector re-extracts every page instead of serving stale data.
+    """
+
+    def __init__(self, store=None, client=None, spec=None):
+        self.store = store or DetailStore()
+        self.client = client or get_client()
+        self.spec = spec_hash(spec) if spec is not None else None
+        self.stats = {'unchanged': 0, 'changed': 0}
+        self._stats_lock = threading.Lock()
+
+    def cached(self, url):
+        """Stored entry for `url`, or None when there is none or it came from another spec."""
+        cached = self.store.get(url)
+        if cached is None or cached['spec'] != self.spec:
+            return None
+        return cached
+
+    def conditional_headers(self, url):
+        # No validators for a payload of another spec: a 304 would leave nothing to re-extract from
+        cached = self.cached(url)
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
+    def unchanged(self, url, status, headers, body):
+        """Stored payload if the response shows the page is unchanged, else None."""
+        cached = self.cached(url)
+        if cached is None:
+            return None
+        if status == 304:
+            self._count('unchanged')
+            return cached['payload']
+        if status == 200 and cached['content_hash'] == content_hash(body):
+            # Same content behind new validators; keep them for the next run
+            self._put(url, headers, body, cached['payload'])
+            self._count('unchanged')
+            return cached['payload']
+        return None
+
+    def remember(self, url, headers, body, payload):
+        """Store the payload extracted from a changed page."""
+        self._put(url, headers, body, payload)
+        self._count('changed')
+
+    def probe(self, url):
+        """Conditional GET; returns (stored payload or None, response).
+
+        For pages that are rendered some other way (e.g. in Selenium): on None,
+        render the page and pass the probe response to `remember`.
+        """
+        response = self.client.get(url, headers=self.conditional_headers(url))
+        cached = self.unchanged(url, response.status_code, response.headers, response.content)
+        if cached is None:
+            response.raise_for_status()
+        return cached, response
+
+    def fetch(self, url, extract):
+        """Return (payload, changed) for `url`, calling `extract(body)` only for changed pages."""
+        cached, response = self.probe(url)
+        if cached is not None:
+            return cached, False
+        payload = extract(response.content)
+        self.remember(url, response.headers, response.content, payload)
+        return payload, True
+
+    def _put(self, url, headers, body, payload):
+        self.store.put(url, headers.get('ETag'), headers.get('Last-Modified'), content_hash(body), payload, self.spec)
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
@@ -0,0 +1,135 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+DEFAULT_CHECKPOINT_PATH = os.path.join('scrape_cache', 'checkpoints.sqlite3')
+
+
+class Checkpoint:
+    """Progress of one category scrape, kept in SQLite so a crashed run can be resumed.
+
+    Records every product discovered on the listing (in listing order) and
+    the finished output row of every detail page. With `resume=True` the
+    last unfinished run for `url` is picked up: finished rows are replayed
+    from the store instead of being scraped again, `pending()` lists only
+    the products still to do, and `listing_done` tells whether the
+    "Load More" pagination has to run again at all. Without it any earlier
+    progress for `url` is discarded.
+    """
+
+    def __init__(self, url, resume=False, path=DEFAULT_CHECKPOINT_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.url = url
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " url TEXT PRIMARY KEY, output_path TEXT, category TEXT, listing_done INTEGER NOT NULL DEFAULT 0,"
+            " started_at REAL NOT NULL, finished_at REAL);"
+            "CREATE TABLE IF NOT EXISTS products ("
+            " url TEXT NOT NULL, key TEXT NOT NULL, position INTEGER NOT NULL, title TEXT, link TEXT,"
+            " row TEXT, PRIMARY KEY (url, key));"
+        )
+
+        with self._lock:
+            run = self._conn.execute(
+                "SELECT output_path, category, listing_done FROM runs WHERE url = ? AND finished_at IS NULL", (url,)
+            ).fetchone()
+            self.resumed = bool(resume and run)
+            if self.resumed:
+                self.output_path, self.category, listing_done = run
+                self.listing_done = bool(listing_done)
+            else:
+                self.output_path = self.category = None
+                self.listing_done = False
+                self._conn.execute("DELETE FROM products WHERE url = ?", (url,))
+                self._conn.execute("INSERT OR REPLACE INTO runs (url, started_at) VALUES (?, ?)", (url, time.time()))
+            self._conn.commit()
+            # Positions are handed out here; new products are only committed with the next write or `commit()`
+            self._next_position = self._conn.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM products WHERE url = ?", (url,)
+            ).fetchone()[0]
+
+    def set_output(self, output_path):
+        self.output_path = output_path
+        self._update("UPDATE runs SET output_path = ? WHERE url = ?", (output_path, self.url))
+
+    def set_category(self, category):
+        self.category = category
+        self._update("UPDATE runs SET category = ? WHERE url = ?", (category, self.url))
+
+    def mark_listing_done(self):
+        self.listing_done = True
+        self._update("UPDATE runs SET listing_done = 1 WHERE url = ?", (self.url,))
+
+    def add(self, key, title, link):
+        """Record a discovered product; False if `key` was already known (pending or done)."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO products (url, key, position, title, link) VALUES (?, ?, ?, ?, ?)",
+                (self.url, key, self._next_position, title, link),
+            )
+            if cursor.rowcount != 1:
+                return False
+            self._next_position += 1
+            return True
+
+    def commit(self):
+        """Persist the products added since the last write (call once per listing page)."""
+        with self._lock:
+            self._conn.commit()
+
+    def pending(self):
+        """(key, title, link) of every product without a finished row, in listing order."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT key, title, link FROM products WHERE url = ? AND row IS NULL ORDER BY position", (self.url,)
+            ).fetchall()
+
+    def done(self, key, row):
+        self._update("UPDATE products SET row = ? WHERE url = ? AND key = ?", (json.dumps(row), self.url, key))
+
+    def products(self):
+        """(key, title, link, row) of every product in listing order; row is None while pending."""
+        with self._lock:
+            products = self._conn.execute(
+                "SELECT key, title, link, row FROM products WHERE url = ? ORDER BY position", (self.url,)
+            ).fetchall()
+        return [(key, title, link, json.loads(row) if row is not None else None)
+                for key, title, link, row in products]
+
+    def finish(self):
+        """Mark the run complete and close the store; a later `resume=True` starts from scratch."""
+        self._update("UPDATE runs SET finished_at = ? WHERE url = ?", (time.time(), self.url))
+        self.close()
+
+    def close(self):
+        """Close the store, committing anything still pending; safe to call more than once."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+
+    def _update(self, sql, params):
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+
+def has_unfinished_run(url, path=DEFAULT_CHECKPOINT_PATH):
+    if not os.path.exists(path):
+        return False
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(
+            "SELECT 1 FROM runs WHERE url = ? AND finished_at IS NULL", (url,)
+        ).fetchone() is not None
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
@@ -0,0 +1,166 @@
+import argparse
+import os
+import sys
+from functools import partial
+
+from .browser_pool import DEFAULT_CHROMEDRIVER_PATH
+from .engine import CategoryScraper, category_slug
+from .export import SINKS
+from .image_store import ImageStore, localize_export
+from .profiles import all_profiles
+from .sharding import default_processes, merge_outputs, merged_columns, profile_for, profiles_for, run_sharded, scrape_products
+
+
+def read_urls(path):
+    """URLs from a file (or "-" for stdin): one per line, blank lines and # comments ignored."""
+    handle = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        urls = [line.split('#', 1)[0].strip() for line in handle]
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+    return list(dict.fromkeys(url for url in urls if url))
+
+
+def download_images(path, options, log=print):
+    """With --download-images, fetch the images of `path` and return the rewritten copy's path."""
+    store = ImageStore(options['image_dir'])
+    try:
+        return localize_export(path, store, base_url=options.get('image_base_url'), log=log)
+    finally:
+        store.close()
+
+
+def scrape_one(url, options):
+    """Scrape one category in this process; returns a summary dict instead of raising."""
+    prefix = category_slug(url)
+
+    def log(message):
+        print(f"[{prefix}] {message}", flush=True)
+
+    try:
+        profile = profile_for(url, options['profile'])
+        scraper = CategoryScraper(
+            url, profile,
+            out_dir=options['out_dir'],
+            fmt=options['format'],
+            concurrency=options['concurrency'],
+            resume=options['resume'],
+            chromedriver_path=options['chromedriver'],
+            headless=options['headless'],
+            check_images=options.get('check_images', False),
+            timings=options.get('timings'),
+            log=log,
+        )
+        output = scraper.run()
+        if options.get('image_dir') and not options.get('merging'):
+            download_images(output, options, log)
+        return {'url': url, 'output': output, 'rows': scraper.rows_written, 'failed': scraper.failed, 'error': None}
+    except Exception as e:
+        log(f"❌ {type(e).__name__}: {e}")
+        return {'url': url, 'output': None, 'rows': 0, 'failed': 0, 'error': f"{type(e).__name__}: {e}"}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m scraper_core',
+        description="Scrape category listings (or bare product pages) across worker processes, "
+                    "one output file per category or everything merged into one.",
+    )
+    parser.add_argument('urls', help="file with one category URL per line ('-' reads stdin)")
+    parser.add_argument('--products', action='store_true',
+                        help="the file lists product pages instead of categories (needs --merge)")
+    parser.add_argument('--merge', metavar='OUTPUT',
+                        help="write every row into this one file (format from its extension) instead of one per category")
+    parser.add_argument('--profile', choices=sorted(all_profiles()),
+                        help="site profile for every URL (default: chosen by each URL's domain)")
+    parser.add_argument('--out-dir', default='.', help="directory for the output files (default: current)")
+    parser.add_argument('--format', default='csv', choices=[ext.lstrip('.') for ext in SINKS])
+    parser.add_argument('--processes', type=int,
+                        help="worker processes; URLs are handed out as workers free up. Each one runs up to "
+                             "--concurrency + 1 Chrome instances (~200-300 MB each) for browser-rendered sites "
+                             "(default: up to 4, fewer with a high --concurrency or few CPUs)")
+    parser.add_argument('--concurrency', type=int, default=4, help="product pages fetched in parallel per category")
+    parser.add_argument('--check-images', action='store_true',
+                        help="HEAD-check every image URL, drop broken ones and write <output>.images.csv")
+    parser.add_argument('--download-images', dest='image_dir', metavar='DIR',
+                        help="download product images into DIR (stored once per content) and write "
+                             "<output>.local.<ext> pointing at them")
+    parser.add_argument('--image-base-url', metavar='URL',
+                        help="with --download-images, point the rewritten export at URL/<stored path> (e.g. a CDN)")
+    parser.add_argument('--timings', action='store_true', default=None,
+                        help="time every stage and write <output>.timings.json (also SCRAPER_TIMINGS=1)")
+    parser.add_argument('--resume', action='store_true', help="continue unfinished runs from their checkpoints")
+    parser.add_argument('--chromedriver', default=os.environ.get('CHROMEDRIVER_PATH', DEFAULT_CHROMEDRIVER_PATH),
+                        help="chromedriver binary; Selenium Manager finds one when this path does not exist")
+    parser.add_argument('--no-headless', dest='headless', action='store_false', help="show the browser windows")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.products and not args.merge:
+        parser.error("--products needs --merge OUTPUT")
+    if args.processes is None:
+        # Bare product pages are fetched one at a time per process
+        args.processes = default_processes(1 if args.products else args.concurrency)
+    urls = read_urls(args.urls)
+    if not urls:
+        print("No URLs to scrape.", file=sys.stderr)
+        return 2
+    os.makedirs(args.out_dir, exist_ok=True)
+    options = {
+        'profile': args.profile,
+        'out_dir': args.out_dir,
+        'format': args.format,
+        'concurrency': args.concurrency,
+        'resume': args.resume,
+        'chromedriver': args.chromedriver,
+        'headless': args.headless,
+        'check_images': args.check_images,
+        'image_dir': args.image_dir,
+        'image_base_url': args.image_base_url,
+        'timings': args.timings,
+    }
+
+    if args.products:
+        failed = scrape_products(urls, args.merge, options, args.processes)
+        print(f"{'⚠️' if failed else '✅'} {len(urls) - len(failed)} of {len(urls)} product pages -> {args.merge}")
+        if args.image_dir:
+            download_images(args.merge, options)
+        return 1 if failed else 0
+
+    if args.merge:
+        # Each category goes to its own JSON Lines shard first; they are merged in input order at the end
+        options = dict(options, out_dir=os.path.join(args.out_dir, '.shards'), format='jsonl', merging=True)
+        os.makedirs(options['out_dir'], exist_ok=True)
+
+    results = list(run_sharded(partial(scrape_one, options=options), urls, args.processes))
+
+    # Non-zero exit when anything needs another (--resume) run, so cron can alert on it
+    incomplete = 0
+    for result in results:
+        if result['error']:
+            incomplete += 1
+            print(f"❌ {result['url']}: {result['error']}")
+        elif result['failed']:
+            incomplete += 1
+            print(f"⚠️ {result['url']}: {result['rows']} rows -> {result['output']} "
+                  f"({result['failed']} product pages failed, --resume retries them)")
+        else:
+            print(f"✅ {result['url']}: {result['rows']} rows -> {result['output']}")
+
+    if args.merge:
+        shards = [result['output'] for result in results if result['output']]
+        rows = merge_outputs(shards, args.merge, merged_columns(profiles_for(urls, args.profile)))
+        if not incomplete:
+            for shard in shards:
+                os.remove(shard)
+            if not os.listdir(options['out_dir']):
+                os.rmdir(options['out_dir'])
+        print(f"✅ Merged {rows} rows from {len(shards)} categories -> {args.merge}")
+        if args.image_dir:
+            download_images(args.merge, options)
+    return 1 if incomplete else 0
+
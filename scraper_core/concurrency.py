@@ -0,0 +1,182 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+
+class HostLimiter:
+    """Politeness limits: at most `max_per_host` requests in flight per host,
+    and request starts to the same host spaced `min_interval` seconds apart."""
+
+    def __init__(self, max_per_host=2, min_interval=0.5):
+        self.max_per_host = max(1, max_per_host)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._next_start = {}
+
+    def _slot(self, host):
+        with self._lock:
+            slot = self._slots.get(host)
+            if slot is None:
+                slot = self._slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return slot
+
+    @contextmanager
+    def limit(self, url):
+        host = urlsplit(url).netloc.lower()
+        slot = self._slot(host)
+        slot.acquire()
+        try:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+        finally:
+            slot.release()
+
+
+def map_bounded(func, items, concurrency=4, on_done=None):
+    """Run `func` over `items` on a bounded thread pool.
+
+    Results come back in input order no matter which worker finishes first.
+    `on_done(done, total)` is called from the calling thread after each item.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    if not items:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {pool.submit(func, item): index for index, item in enumerate(items)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            results[futures[future]] = future.result()
+            if on_done:
+                on_done(done, len(items))
+    return results
+
+
+class StreamingMap:
+    """Producer/consumer variant of `map_bounded` for items that trickle in.
+
+    `submit(item)` queues an item and returns at once; up to `concurrency`
+    workers start on it immediately. `on_done(done, submitted)` is called from
+    the worker threads as items finish. With `on_result(item, result)`, results
+    are handed over in submission order as soon as they are ready and are not
+    kept afterwards; call `wait()` at the end. Otherwise `results()` waits for
+    everything and returns the results in submission order.
+    """
+
+    def __init__(self, func, concurrency=4, on_done=None, on_result=None):
+        self.func = func
+        self.on_done = on_done
+        self.on_result = on_result
+        self._pool = ThreadPoolExecutor(max_workers=max(1, concurrency))
+        self._items = []
+        self._futures = []
+        self._lock = threading.Lock()
+        self._done = 0
+        self._next = 0
+
+    def submit(self, item):
+        future = self._pool.submit(self.func, item)
+        with self._lock:
+            self._items.append(item)
+            self._futures.append(future)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future):
+        if future.cancelled():
+            return
+        with self._lock:
+            self._done += 1
+            done, submitted = self._done, len(self._futures)
+            if self.on_result:
+                # Hand over the finished prefix in order and drop our references to it
+                while self._next < submitted and self._futures[self._next].done():
+                    ready = self._futures[self._next]
+                    if ready.cancelled():
+                        break
+                    if ready.exception() is None:
+                        self.on_result(self._items[self._next], ready.result())
+                        # Failed futures are kept so wait() can re-raise them
+                        self._futures[self._next] = None
+                    self._items[self._next] = None
+                    self._next += 1
+        if self.on_done:
+            self.on_done(done, submitted)
+
+    def results(self):
+        try:
+            return [future.result() for future in self._futures]
+        finally:
+            self._pool.shutdown(wait=True)
+
+    def wait(self):
+        """Wait for every submitted item; re-raises the first worker exception."""
+        self._pool.shutdown(wait=True)
+        for future in self._futures:
+            if future is not None:
+                future.result()
+
+    def cancel(self):
+        """Drop the items not started yet and wait for the running ones.
+
+        Once this returns no worker (and no `on_result`) is still running,
+        so whatever they write to can be closed or thrown away safely.
+        """
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+class Cancelled(Exception):
+    """Raised at the next checkpoint of a run whose `RunControl` was cancelled."""
+
+
+class RunControl:
+    """Pause, resume and cancel for a running scrape, from any thread.
+
+    The scrape calls `checkpoint()` at safe points (between pages and
+    products): it returns at once while running, blocks while paused and
+    raises `Cancelled` once cancelled. `sleep()` is a wait that a cancel
+    cuts short.
+    """
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def cancel(self):
+        self._cancelled.set()
+        # Wake anything waiting in a paused checkpoint so it can stop
+        self._running.set()
+
+    def checkpoint(self):
+        if not self._running.is_set():
+            self._running.wait()
+        if self._cancelled.is_set():
+            raise Cancelled()
+
+    def sleep(self, seconds):
+        if self._cancelled.wait(seconds):
+            raise Cancelled()
+        self.checkpoint()
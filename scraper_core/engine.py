@@ -0,0 +1,468 @@
+import os
+import re
+from urllib.parse import urlsplit
+
+import requests
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from . import instrument
+from .browser_pool import DEFAULT_CHROMEDRIVER_PATH, get_pool
+from .change_detection import ChangeTracker
+from .checkpoint import Checkpoint
+from .concurrency import HostLimiter, RunControl, StreamingMap
+from .export import open_sink
+from .fetch_strategy import fetch_listing
+from .http_client import get_client
+from .images import ImageStage, best_candidate, canonical_image_url, first_candidate, https_url, normalize_image_url
+from .js_extract import ExtractionSpec, extract_records
+from .pagination import load_all, scroll_all
+from .parsing import Node, compile_css, parse_html
+from .response_cache import cache_from_env, cached_render
+
+
+NO_LINK = 'No link available'
+
+
+TRANSFORMS = {'first_candidate': first_candidate, 'best_candidate': best_candidate, 'https': https_url}
+
+
+def field_value(node, css, how):
+    """Python twin of the per-field rules in js_extract.EXTRACT_JS."""
+    element = node.select_one(css) if css else node
+    if element is None:
+        return None
+    if how == 'text':
+        return element.text('', strip=True)
+    if how == 'words':
+        return element.text(' ', strip=True)
+    if how == 'raw':
+        return element.text('', strip=False).strip()
+    return element.attr(how[1:])
+
+
+def records_from_tree(root, spec):
+    """Python twin of `EXTRACT_JS` for a parsed page: one {field name: value} dict per card."""
+    fields = [(name, compile_css(css) if css else None, how) for name, css, how in spec.fields]
+    return [{name: field_value(card, css, how) for name, css, how in fields}
+            for card in root.select(compile_css(spec.card_css))]
+
+
+class CompiledProfile:
+    """A profile with every selector compiled and every transform resolved, built once per profile.
+
+    Cards and detail pages are matched with these objects, so selector text
+    is never parsed again while a scrape runs.
+    """
+
+    def __init__(self, profile):
+        self.profile = profile
+        listing = profile['listing']
+        self.card = compile_css(listing['card'])
+        self.fields = []
+        for name, field in listing['fields'].items():
+            transforms = field[2] if len(field) > 2 else []
+            transforms = [transforms] if isinstance(transforms, str) else transforms
+            unknown = [t for t in transforms if t not in TRANSFORMS]
+            if unknown:
+                raise ValueError(f"Profile {profile['name']!r}: unknown transforms {unknown} for field {name!r}")
+            css = compile_css(field[0]) if field[0] else None
+            self.fields.append((name, css, field[1], [TRANSFORMS[t] for t in transforms]))
+
+        detail = profile['detail']
+        self.detail_title = compile_css(detail['title']) if detail.get('title') else None
+        self.detail_images = compile_css(detail['images'][0]) if detail.get('images') else None
+        self.detail_images_how = detail['images'][1] if detail.get('images') else None
+        self.detail_description = compile_css(detail['description']) if detail.get('description') else None
+
+        self.listing_spec = ExtractionSpec(listing['card'], [(name, field[0], field[1])
+                                                             for name, field in listing['fields'].items()])
+        self.category_spec = ExtractionSpec(listing.get('category') or 'h2', [('category', '', 'words')])
+
+
+_compiled = {}
+
+
+def compiled(profile):
+    """Cached `CompiledProfile` of `profile` (recompiled if a profile of that name was replaced)."""
+    entry = _compiled.get(profile['name'])
+    if entry is None or entry.profile is not profile:
+        entry = _compiled[profile['name']] = CompiledProfile(profile)
+    return entry
+
+
+def listing_spec(profile):
+    return compiled(profile).listing_spec
+
+
+def category_spec(profile):
+    return compiled(profile).category_spec
+
+
+def finish_card(profile, values):
+    """Apply transforms, defaults and link resolution to raw card values."""
+    card = {}
+    for name, _, _, transforms in compiled(profile).fields:
+        value = values.get(name)
+        for transform in transforms:
+            value = transform(value)
+        card[name] = value if value else f'No {name} available'
+
+    link = values.get('link') or ''
+    if link.startswith('/'):
+        link = profile['base_url'].rstrip('/') + link
+    card['link'] = link if link.startswith('http') else NO_LINK
+    return card
+
+
+def card_from_node(profile, node):
+    return finish_card(profile, {name: field_value(node, css, how) for name, css, how, _ in compiled(profile).fields})
+
+
+def parse_detail(profile, html):
+    """{'images': [...], 'description': ...} from a product page, plus 'title' when the profile reads one."""
+    with instrument.span('parse.detail'):
+        return _parse_detail(compiled(profile), profile, html)
+
+
+def _parse_detail(matchers, profile, html):
+    root = parse_html(html)
+
+    images = {}
+    if matchers.detail_images is not None:
+        for element in root.select(matchers.detail_images):
+            # Largest srcset candidate; lazy-load placeholders (data: URIs) come back as None
+            url = normalize_image_url(best_candidate(field_value(element, None, matchers.detail_images_how)),
+                                      profile['base_url'])
+            if url:
+                images.setdefault(canonical_image_url(url), url)
+    images = list(images.values())
+
+    description = None
+    if matchers.detail_description is not None:
+        element = root.select_one(matchers.detail_description)
+        description = element.text('\n', strip=True) if element is not None else None
+    details = {'images': images, 'description': description or 'No description available'}
+
+    if matchers.detail_title is not None:
+        element = root.select_one(matchers.detail_title)
+        details['title'] = (element.text('', strip=True) if element is not None else None) or 'No title available'
+    return details
+
+
+def build_row(profile, category, card, details):
+    # Listing values win over the same field read from the product page
+    values = dict(details, **card)
+    values['category'] = category
+    placeholders = profile.get('placeholders', {})
+    row = {}
+    for column, field in profile['columns'].items():
+        value = values.get(field)
+        if field in placeholders and (not value or value == f'No {field} available'):
+            value = placeholders[field]
+        row[column] = ", ".join(value) if isinstance(value, list) else value
+    row.update(profile.get('constants', {}))
+    return row
+
+
+def fetch_cards(url, profile, client=None, render=None):
+    """(category, cards) of an HTTP listing, via scraper_core.fetch_strategy."""
+    with instrument.span('listing.fetch'):
+        listing = fetch_listing(
+            url, compiled(profile).card.pattern, lambda tag: card_from_node(profile, Node(tag)),
+            render=render, session=client,
+        )
+    # Cards from /products.json are already clean but may lack (or have empty) fields the profile lists
+    defaults = {name: f'No {name} available' for name in profile['listing']['fields']}
+    return listing.category, [dict(card, **{name: card.get(name) or default for name, default in defaults.items()})
+                              for card in listing.cards]
+
+
+def category_slug(url):
+    """File-name friendly name of a category: the last segment of its URL path."""
+    parts = [part for part in urlsplit(url).path.split('/') if part]
+    return re.sub(r'[^A-Za-z0-9_.-]+', '-', parts[-1] if parts else urlsplit(url).hostname or 'listing')
+
+
+def render_listing(pool, url, card_css):
+    """Page source of a listing that only exists after JavaScript has run, scrolled to the end."""
+    with pool.lease() as driver:
+        with instrument.span('browser.navigate'):
+            driver.get(url)
+        with instrument.span('listing.scroll'):
+            scroll_all(driver, card_css)
+        with instrument.span('browser.page_source'):
+            return driver.page_source
+
+
+def output_path_for(url, out_dir='.', fmt='csv'):
+    """One output file per category, named after the category slug."""
+    return os.path.join(out_dir, f'{category_slug(url)}.{fmt}')
+
+
+class CategoryScraper:
+    """Scrapes one category listing and its product pages into one output file.
+
+    The site specifics come from a profile (see scraper_core.profiles). Detail
+    pages are fetched by `concurrency` workers while the listing is still
+    paginating. Unchanged pages are served from the change tracker. Rows are
+    streamed to the sink, and progress is checkpointed so `resume=True`
+    continues an interrupted run. `log(message)`, `progress(done, total)` and
+    `on_row(row)` let callers (CLI, Qt, Django) follow along. Image URLs
+    (the `image` and `images` fields) go through one ImageStage per run, and
+    with `check_images=True` broken ones are dropped and their metadata is
+    written next to the output. A `RunControl` passed as `control` pauses or
+    cancels the run between pages and products; a cancelled run is
+    checkpointed like a crashed one. With `timings=True` (default: the
+    SCRAPER_TIMINGS environment variable) every stage is timed and a
+    `<output>.timings.json` report is written next to the output.
+    """
+
+    def __init__(self, url, profile, output_path=None, out_dir='.', fmt='csv', concurrency=4,
+                 resume=False, chromedriver_path=DEFAULT_CHROMEDRIVER_PATH, headless=True,
+                 max_per_host=2, min_interval=0.5, cache=None, check_images=False, log=print, progress=None,
+                 on_row=None, control=None, timings=None):
+        self.url = url
+        self.profile = profile
+        self.output_path = output_path or output_path_for(url, out_dir, fmt)
+        self.concurrency = concurrency
+        self.resume = resume
+        self.chromedriver_path = chromedriver_path
+        self.headless = headless
+        self.host_limiter = HostLimiter(max_per_host=max_per_host, min_interval=min_interval)
+        self.cache = cache if cache is not None else cache_from_env()
+        self.log = log or (lambda message: None)
+        self.progress = progress
+        self.on_row = on_row
+        self.control = control or RunControl()
+        self.timings = instrument.timings_from_env() if timings is None else timings
+        self.client = get_client()
+        self.change_tracker = ChangeTracker(client=self.client, spec=profile['detail'])
+        self.check_images = check_images
+        self.images = ImageStage(base_url=profile['base_url'], client=self.client)
+        self._browser_pool = None
+        self.rows_written = 0
+        self.failed = 0
+
+    @property
+    def browser_pool(self):
+        # Browsers are only started when the profile (or a fallback) needs one;
+        # one extra for the listing page, which stays open while details are fetched
+        if self._browser_pool is None:
+            size = self.concurrency + 1
+            self._browser_pool = get_pool(self.chromedriver_path, headless=self.headless, size=size)
+        return self._browser_pool
+
+    def run(self):
+        """Scrape everything and return the output path."""
+        timings_path = instrument.timings_path_for(self.output_path) if self.timings else None
+        with instrument.recording(timings_path, url=self.url, profile=self.profile['name']) as recorder:
+            output_path = self._run()
+            if recorder.enabled:
+                recorder.meta.update(output=output_path, rows=self.rows_written, failed=self.failed)
+        if timings_path:
+            self.log(f"Stage timings -> {timings_path}")
+        return output_path
+
+    def _run(self):
+        self.checkpoint = Checkpoint(self.url, resume=self.resume)
+        if self.resume and not self.checkpoint.resumed:
+            self.log("Nothing to resume for this URL, starting a new run.")
+        if not self.checkpoint.resumed or not self.checkpoint.output_path:
+            self.checkpoint.set_output(self.output_path)
+        self.output_path = self.checkpoint.output_path
+
+        columns = list(self.profile['columns']) + list(self.profile.get('constants', {}))
+        self.sink = open_sink(self.output_path, columns=columns)
+        self.details = StreamingMap(self.process_card, self.concurrency,
+                                    on_done=self.progress, on_result=self.write_row)
+        self.category = self.checkpoint.category
+        self.queued = 0
+        try:
+            if self.checkpoint.resumed:
+                self.resume_checkpoint()
+            if not self.checkpoint.listing_done:
+                self.scrape_listing()
+                self.checkpoint.mark_listing_done()
+            self.log(f"Found {self.queued} products to fetch, waiting for the remaining details...")
+            self.details.wait()
+        except Exception:
+            # Workers already fetching may still hand rows to the sink; let them finish first
+            self.details.cancel()
+            self.sink.abort()
+            self.checkpoint.close()
+            self.log("❌ Scrape stopped, resume to continue where it left off.")
+            raise
+
+        stats = self.change_tracker.stats
+        self.log(f"Product pages changed: {stats['changed']}, unchanged (skipped): {stats['unchanged']}")
+        instrument.count('detail.changed', stats['changed'])
+        instrument.count('detail.unchanged', stats['unchanged'])
+        with instrument.span('export.close'):
+            self.sink.close()
+        failed = self.checkpoint.pending()
+        self.failed = len(failed)
+        instrument.count('detail.failed', self.failed)
+        if failed:
+            self.log(f"⚠️ {len(failed)} product pages failed, resume to retry only those.")
+            self.checkpoint.close()
+        else:
+            self.checkpoint.finish()
+        if self.check_images:
+            self.write_image_report()
+        return self.output_path
+
+    def resume_checkpoint(self):
+        # Finished rows go through the queue too, so the file keeps the listing order
+        products = self.checkpoint.products()
+        pending = sum(1 for product in products if product[3] is None)
+        self.log(f"Resuming: {len(products) - pending} products already done, {pending} queued again.")
+        for key, title, link, row in products:
+            self.details.submit((key, {'title': title, 'link': link}, row))
+        self.queued += pending
+
+    # ✅ Listing
+    def scrape_listing(self):
+        if self.profile['listing']['mode'] in ('load_more', 'scroll'):
+            with self.browser_pool.lease() as driver:
+                self.scrape_browser_listing(driver)
+        else:
+            category, cards = fetch_cards(self.url, self.profile, self.client, render=self.render_listing)
+            self.control.checkpoint()
+            self.set_category(category)
+            self.queue_cards(cards, start=0)
+
+    def scrape_browser_listing(self, driver):
+        with instrument.span('browser.navigate'):
+            driver.get(self.url)
+        self.extracted = 0
+        if self.category is None:
+            category = extract_records(driver, category_spec(self.profile))
+            self.set_category(category[0]['category'] if category and category[0]['category'] else None)
+
+        # Only the cards appended since the previous page are read and queued
+        spec = listing_spec(self.profile)
+
+        def queue_new_cards(count=None):
+            self.control.checkpoint()
+            with instrument.span('listing.extract'):
+                new_cards = [finish_card(self.profile, values)
+                             for values in extract_records(driver, spec, start=self.extracted)]
+            self.queue_cards(new_cards, start=self.extracted)
+            self.extracted += len(new_cards)
+
+        if self.profile['listing']['mode'] == 'scroll':
+            with instrument.span('listing.scroll'):
+                scroll_all(driver, spec.card_css)
+        else:
+            # Includes queueing the cards of each page (timed separately as "listing.extract")
+            with instrument.span('listing.load_more'):
+                load_all(driver, spec.card_css, self.profile['listing']['load_more'], log=self.log,
+                         on_page=queue_new_cards)
+        queue_new_cards()
+
+    def render_listing(self, url):
+        # Fallback for listings that only exist after JavaScript has run
+        return render_listing(self.browser_pool, url, self.profile['listing']['card'])
+
+    def set_category(self, category):
+        self.category = category or 'No category available'
+        self.checkpoint.set_category(self.category)
+
+    def queue_cards(self, cards, start):
+        queued = 0
+        for position, card in enumerate(cards, start=start):
+            # Products already known (queued earlier or finished before a resume) are skipped
+            key = card['link'] if card['link'] != NO_LINK else f'no-link:{position}'
+            if not self.checkpoint.add(key, card['title'], card['link']):
+                continue
+            self.details.submit((key, card, None))
+            queued += 1
+        self.checkpoint.commit()
+        self.queued += queued
+        instrument.count('products.queued', queued)
+        if queued:
+            self.log(f"Queued {queued} new products ({self.queued} so far).")
+
+    # ✅ Product pages
+    def process_card(self, item):
+        key, card, done_row = item
+        if done_row is not None:
+            return done_row
+        self.control.checkpoint()
+        try:
+            with instrument.span('detail.fetch'):
+                details = self.fetch_details(card['link'])
+        except Exception:
+            # Failed pages stay pending and are retried on resume, no placeholder row is written
+            return None
+
+        with instrument.span('images.process'):
+            card, details = self.process_images(card, details)
+        row = build_row(self.profile, self.category, card, details)
+        self.checkpoint.done(key, row)
+        return row
+
+    def process_images(self, card, details):
+        """Best, de-duplicated (and with check_images, reachable) image URLs; returns new dicts."""
+        return self.images.process(card, details, self.check_images)
+
+    def write_image_report(self):
+        path = os.path.splitext(self.output_path)[0] + '.images.csv'
+        with open_sink(path, columns=['url', 'ok', 'status', 'content_type', 'size', 'error']) as sink:
+            sink.write_many(self.images.info.values())
+        broken = sum(1 for info in self.images.info.values() if not info['ok'])
+        self.log(f"Checked {len(self.images.info)} images ({broken} broken) -> {path}")
+
+    def fetch_details(self, link):
+        if link == NO_LINK:
+            return {'images': [], 'description': 'No description available'}
+
+        if self.profile['detail']['mode'] == 'http':
+            with self.host_limiter.limit(link), instrument.span('detail.http'):
+                details, _ = self.change_tracker.fetch(link, lambda body: parse_detail(self.profile, body))
+            return details
+
+        # A cheap conditional request tells whether the page changed since the last run
+        probe = None
+        try:
+            with self.host_limiter.limit(link), instrument.span('detail.probe'):
+                cached, probe = self.change_tracker.probe(link)
+            if cached is not None:
+                return cached
+        except requests.exceptions.RequestException:
+            pass
+
+        # The probe already downloaded the page; only render it when the description needs JavaScript
+        details = parse_detail(self.profile, probe.content) if probe is not None else None
+        if details is None or details['description'] == 'No description available':
+            instrument.count('detail.rendered')
+            details = parse_detail(self.profile, cached_render(link, self.cache, self.render_detail))
+        if probe is not None and details['description'] != 'No description available':
+            self.change_tracker.remember(link, probe.headers, probe.content, details)
+        return details
+
+    def render_detail(self, link):
+        wait_for = self.profile['detail'].get('wait_for')
+        with self.host_limiter.limit(link), self.browser_pool.lease() as driver:
+            driver.set_page_load_timeout(10)
+            with instrument.span('browser.navigate'):
+                driver.get(link)
+            if wait_for:
+                with instrument.span('detail.wait'):
+                    try:
+                        WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, wait_for)))
+                    except Exception:
+                        pass
+            with instrument.span('browser.page_source'):
+                return driver.page_source
+
+    def write_row(self, item, row):
+        if row is None:
+            return
+        with instrument.span('export.write'):
+            self.sink.write(row)
+        self.rows_written += 1
+        if self.on_row:
+            self.on_row(row)
@@ -0,0 +1,190 @@
+import csv
+import json
+import os
+import threading
+import time
+
+
+class ExportSink:
+    """Writes rows to `path` as they are produced instead of at the end of a run.
+
+    Rows go to `<path>.part` and are flushed to disk every `flush_every` rows
+    or `flush_interval` seconds. `close()` renames the finished file into
+    place, so `path` is either absent or complete. When used as a context
+    manager and the block raises, the `.part` file is left behind with
+    every row written so far.
+    """
+
+    def __init__(self, path, columns=None, flush_every=50, flush_interval=5.0):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.temp_path = path + '.part'
+        self.columns = list(columns) if columns else None
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.count = 0
+        self.closed = False
+        self._lock = threading.Lock()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        self._open()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, row):
+        with self._lock:
+            if self.columns is None:
+                self.columns = list(row)
+                self._start(self.columns)
+            self._write_row(row)
+            self.count += 1
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        """Finish the file and move it to `path`; returns `path`."""
+        with self._lock:
+            if self.closed:
+                return self.path
+            if self.columns is None:
+                self.columns = []
+                self._start(self.columns)
+            self._finish()
+            self.closed = True
+            os.replace(self.temp_path, self.path)
+            return self.path
+
+    def abort(self):
+        """Stop writing and keep the rows so far in the `.part` file; `path` is not touched."""
+        with self._lock:
+            if not self.closed:
+                if self.columns is None:
+                    self.columns = []
+                    self._start(self.columns)
+                self._finish()
+                self.closed = True
+
+    def _flush(self):
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    # Format specific hooks
+    def _open(self):
+        if self.columns is not None:
+            self._start(self.columns)
+
+    def _start(self, columns):
+        pass
+
+    def _write_row(self, row):
+        raise NotImplementedError
+
+    def _finish(self):
+        pass
+
+
+class _TextSink(ExportSink):
+    def _open(self):
+        self.file = open(self.temp_path, 'w', encoding='utf-8', newline='')
+        super()._open()
+
+    def _flush(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        super()._flush()
+
+    def _finish(self):
+        self._flush()
+        self.file.close()
+
+
+class CsvSink(_TextSink):
+    def _start(self, columns):
+        self.writer = csv.DictWriter(self.file, fieldnames=columns)
+        self.writer.writeheader()
+
+    def _write_row(self, row):
+        self.writer.writerow(row)
+
+
+class JsonLinesSink(_TextSink):
+    def _write_row(self, row):
+        self.file.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+
+class XlsxSink(ExportSink):
+    """Write-only openpyxl workbook: rows are streamed out, never held as cells.
+
+    An xlsx file is only valid once saved, so periodic flushes are a no-op
+    here; an aborted run still saves what it has to the `.part` file.
+    """
+
+    def _open(self):
+        from openpyxl import Workbook
+
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet()
+        super()._open()
+
+    def _start(self, columns):
+        self.sheet.append(columns)
+
+    def _write_row(self, row):
+        self.sheet.append([row.get(column) for column in self.columns])
+
+    def _finish(self):
+        self.workbook.save(self.temp_path)
+
+
+SINKS = {'.csv': CsvSink, '.jsonl': JsonLinesSink, '.xlsx': XlsxSink}
+
+
+def open_sink(path, columns=None, **kwargs):
+    """Sink for `path`, chosen by its extension (.csv, .jsonl or .xlsx)."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SINKS:
+        raise ValueError(f"Unsupported export format {extension!r}; use one of {', '.join(SINKS)}")
+    return SINKS[extension](path, columns, **kwargs)
+
+
+def read_rows(path):
+    """Yield the rows of an exported .csv, .jsonl or .xlsx file as dicts, one at a time."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        with open(path, encoding='utf-8', newline='') as f:
+            yield from csv.DictReader(f)
+    elif extension == '.jsonl':
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif extension == '.xlsx':
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            columns = next(rows, None) or []
+            for values in rows:
+                yield dict(zip(columns, values))
+        finally:
+            workbook.close()
+    else:
+        raise ValueError(f"Unsupported export format {extension!r}; use one of {', '.join(SINKS)}")
@@ -0,0 +1,125 @@
+from urllib.parse import urlsplit, urlunsplit, urlencode, parse_qsl
+
+import requests
+
+from .http_client import get_client
+from .parsing import make_soup
+from .response_cache import CacheMiss
+
+
+class ListingResult:
+    def __init__(self, category, cards, strategy):
+        self.category = category
+        self.cards = cards
+        self.strategy = strategy
+
+
+def with_query(url, **params):
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.update({key: str(value) for key, value in params.items()})
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+
+def page_category(soup, default='No category available'):
+    category_tag = soup.find('h2')
+    return category_tag.get_text(separator=" ", strip=True) if category_tag else default
+
+
+def cards_from_html(html, card_selector, parse_card):
+    soup = make_soup(html)
+    return soup, [parse_card(tag) for tag in soup.select(card_selector)]
+
+
+def fetch_paged_html(url, card_selector, parse_card, session, max_pages=100):
+    """Walk `?page=N` listing pages over plain HTTP.
+
+    Returns None when the first page does not contain the expected cards,
+    which usually means they are rendered by JavaScript.
+    """
+    category = None
+    cards = []
+    seen = set()
+    for page in range(1, max_pages + 1):
+        response = session.get(with_query(url, page=page))
+        response.raise_for_status()
+        soup, page_cards = cards_from_html(response.content, card_selector, parse_card)
+        if page == 1:
+            if not page_cards:
+                return None
+            category = page_category(soup)
+
+        new_cards = [card for card in page_cards if card['link'] not in seen]
+        if not new_cards:
+            break
+        seen.update(card['link'] for card in new_cards)
+        cards.extend(new_cards)
+    return ListingResult(category, cards, 'html')
+
+
+def fetch_shopify_json(url, session, max_pages=100):
+    """Read a Shopify collection through its `/products.json` endpoint."""
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    collection_path = parts.path.rstrip('/')
+
+    cards = []
+    for page in range(1, max_pages + 1):
+        response = session.get(
+            f"{origin}{collection_path}/products.json",
+            params={'limit': 250, 'page': page},
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        products = response.json().get('products', [])
+        if not products:
+            break
+        for product in products:
+            images = product.get('images') or []
+            variants = product.get('variants') or []
+            cards.append({
+                'title': product.get('title', 'No title available'),
+                'link': f"{origin}/products/{product['handle']}",
+                'image': images[0]['src'] if images else 'No image available',
+                # None like the HTML card parsers, so callers pick their own placeholder
+                'price': variants[0].get('price') if variants else None,
+            })
+    if not cards:
+        return None
+
+    category = 'No category available'
+    try:
+        response = session.get(f"{origin}{collection_path}.json")
+        if response.ok:
+            category = response.json()['collection']['title']
+    except (requests.exceptions.RequestException, ValueError, KeyError):
+        pass
+    return ListingResult(category, cards, 'products.json')
+
+
+def fetch_listing(url, card_selector, parse_card, render=None, session=None):
+    """Fetch a collection listing as cheaply as the site allows.
+
+    Tries the plain `?page=N` HTML pages first, then the Shopify
+    `/products.json` endpoint, and only when both come back without
+    products calls `render(url)`, which must return the fully loaded page
+    source (normally from Selenium).
+    """
+    session = session or get_client()
+    for strategy in (
+        lambda: fetch_paged_html(url, card_selector, parse_card, session),
+        lambda: fetch_shopify_json(url, session),
+    ):
+        try:
+            result = strategy()
+        except (requests.exceptions.RequestException, CacheMiss, ValueError):
+            # A page missing from a replayed cache counts like one the site failed to serve
+            result = None
+        if result is not None:
+            return result
+
+    if render is None:
+        return ListingResult('No category available', [], 'none')
+    soup, cards = cards_from_html(render(url), card_selector, parse_card)
+    return ListingResult(page_category(soup), cards, 'browser')
@@ -0,0 +1,115 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.models import PreparedRequest
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from .response_cache import cache_from_env
+
+try:
+    import brotli  # noqa: F401  urllib3 decodes "br" bodies when this is importable
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "Connection": "keep-alive",
+}
+
+
+class HttpClient:
+    """One keep-alive `requests.Session` for all detail and listing fetches.
+
+    Connections are pooled per host and capped at `max_per_host`; extra
+    callers block until a connection frees up. Failed requests (connection
+    errors and 429/5xx) are retried with exponential backoff. With a
+    `ResponseCache`, GET responses (except streamed ones) are served from
+    and saved to it.
+    """
+
+    def __init__(self, max_per_host=4, max_hosts=10, retries=3, backoff_factor=0.5,
+                 status_forcelist=(429, 500, 502, 503, 504), timeout=20, headers=None, cache=None):
+        self.timeout = timeout
+        self.cache = cache
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=max_hosts,
+            pool_maxsize=max_per_host,
+            pool_block=True,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        # Streamed bodies (image downloads) are never read into memory for the cache
+        if self.cache is None or method != "GET" or kwargs.get("stream"):
+            return self.session.request(method, url, **kwargs)
+
+        prepared = PreparedRequest()
+        prepared.prepare_url(url, kwargs.pop("params", None))
+        cached = self.cache.get(prepared.url)
+        if cached is not None:
+            return response_from_cache(cached)
+        response = self.session.request(method, prepared.url, **kwargs)
+        if response.status_code == 200:
+            self.cache.put(prepared.url, response.status_code, response.headers, response.content)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault("allow_redirects", True)
+        return self.request("HEAD", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+def response_from_cache(cached):
+    response = requests.Response()
+    response.status_code = cached.status
+    response.headers = CaseInsensitiveDict(cached.headers)
+    response.url = cached.url
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response._content = cached.body
+    response.from_cache = True
+    return response
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide shared client, created on first use."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HttpClient(cache=cache_from_env())
+        return _default_client
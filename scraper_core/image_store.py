@@ -0,0 +1,234 @@
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+from .concurrency import map_bounded
+from .export import SINKS, open_sink, read_rows
+from .http_client import get_client
+
+
+DEFAULT_IMAGE_DIR = 'images'
+IMAGE_COLUMNS = ('Images', 'Image URL')
+EXTENSIONS = {
+    'image/jpeg': '.jpg', 'image/png': '.png', 'image/webp': '.webp', 'image/gif': '.gif',
+    'image/avif': '.avif', 'image/svg+xml': '.svg',
+}
+
+
+def split_images(value):
+    """URLs of a comma-joined "Images" cell."""
+    return [url.strip() for url in (value or '').split(', ') if url.strip().startswith(('http://', 'https://'))]
+
+
+class ImageStore:
+    """Downloads images into a content-addressed directory.
+
+    Every file is stored once under `<root>/<2 hex>/<sha256><ext>`, no
+    matter how many products or runs use it. Bodies are streamed to
+    `<root>/.partial/` in `chunk_size` pieces, so memory stays flat; an
+    interrupted download continues with a Range request on the next
+    attempt. Each download writes to a file of its own (see
+    `claim_partial`), so threads and shard processes fetching the same URL
+    never append to one file. A small SQLite index maps source URLs to
+    stored files, so known URLs are not downloaded again.
+    """
+
+    def __init__(self, root=DEFAULT_IMAGE_DIR, client=None, concurrency=8, chunk_size=64 * 1024):
+        self.root = root
+        self.client = client
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.errors = {}
+        self.downloaded = 0
+        os.makedirs(os.path.join(root, '.partial'), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, 'index.sqlite3'), timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS images ("
+            " url TEXT PRIMARY KEY, path TEXT NOT NULL, content_type TEXT, size INTEGER, stored_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def path_for(self, url):
+        """Stored path (relative to `root`) of `url`, or None when it has not been downloaded."""
+        with self._lock:
+            row = self._conn.execute("SELECT path FROM images WHERE url = ?", (url,)).fetchone()
+        if row and os.path.exists(os.path.join(self.root, row[0])):
+            return row[0]
+        return None
+
+    def fetch(self, url):
+        """Download `url` (or reuse the stored copy) and return its path relative to `root`."""
+        path = self.path_for(url)
+        if path:
+            return path
+
+        shared, part = self.claim_partial(url)
+        try:
+            return self._download(url, part)
+        except BaseException:
+            self.release_partial(shared, part)
+            raise
+
+    def claim_partial(self, url):
+        """(resumable name, private name) of the temp file for `url`.
+
+        The bytes an earlier attempt left under the resumable name are taken
+        over by renaming them to a name of this process and thread. Rename
+        is atomic, so when two downloaders race only one of them resumes and
+        the other starts from scratch.
+        """
+        shared = os.path.join(self.root, '.partial', hashlib.sha1(url.encode('utf-8')).hexdigest() + '.part')
+        private = f'{shared[:-len(".part")]}.{os.getpid()}-{threading.get_ident()}.part'
+        try:
+            os.replace(shared, private)
+        except FileNotFoundError:
+            pass
+        return shared, private
+
+    def release_partial(self, shared, private):
+        """Hand an unfinished download back under the resumable name for the next attempt."""
+        try:
+            if os.path.exists(shared):
+                os.remove(private)
+            else:
+                os.replace(private, shared)
+        except FileNotFoundError:
+            pass
+
+    def _download(self, url, part):
+        client = self.client or get_client()
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        digest = hashlib.sha256()
+        # Byte ranges only line up with the file when the body is not re-encoded
+        headers = {'Accept-Encoding': 'identity'}
+        if offset:
+            headers['Range'] = f'bytes={offset}-'
+
+        response = client.get(url, headers=headers, stream=True)
+        try:
+            if response.status_code == 416 and offset:
+                mode = None  # the partial file already holds the whole body
+            elif response.status_code == 206 and offset:
+                mode = 'ab'
+            else:
+                response.raise_for_status()
+                mode = 'wb'
+            if mode != 'wb':
+                with open(part, 'rb') as f:
+                    for chunk in iter(lambda: f.read(self.chunk_size), b''):
+                        digest.update(chunk)
+            if mode:
+                with open(part, mode) as f:
+                    for chunk in response.iter_content(self.chunk_size):
+                        f.write(chunk)
+                        digest.update(chunk)
+            content_type = (response.headers.get('Content-Type') or '').split(';')[0].strip()
+        finally:
+            response.close()
+
+        extension = EXTENSIONS.get(content_type) or os.path.splitext(urlsplit(url).path)[1].lower() or '.bin'
+        hexdigest = digest.hexdigest()
+        path = f'{hexdigest[:2]}/{hexdigest}{extension}'
+        target = os.path.join(self.root, path)
+        size = os.path.getsize(part)
+        if os.path.exists(target):
+            os.remove(part)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(part, target)
+
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?, ?)",
+                               (url, path, content_type or None, size, time.time()))
+            self._conn.commit()
+            self.downloaded += 1
+        return path
+
+    def fetch_many(self, urls, on_done=None):
+        """{url: stored path or None} for `urls`, downloaded `concurrency` at a time; failures land in `errors`."""
+        urls = list(dict.fromkeys(urls))
+
+        def fetch(url):
+            try:
+                return self.fetch(url)
+            except (requests.exceptions.RequestException, OSError) as e:
+                with self._lock:
+                    self.errors[url] = f"{type(e).__name__}: {e}"
+                return None
+
+        return dict(zip(urls, map_bounded(fetch, urls, self.concurrency, on_done=on_done)))
+
+    def location(self, path, base_url=None):
+        """Where the export should point: `base_url` + path for a CDN, else the local file."""
+        if base_url:
+            return base_url.rstrip('/') + '/' + path
+        return os.path.join(self.root, *path.split('/'))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def localize_export(path, store, output_path=None, base_url=None, columns=IMAGE_COLUMNS, log=print):
+    """Download the images of an export and write a copy that points at the stored files.
+
+    The export is read twice, row by row: once to collect the image URLs and
+    once to rewrite them, so only the URL list is held in memory. Images that
+    fail to download keep their original URL. Returns the new file's path
+    (`<name>.local<ext>` next to the export unless `output_path` is given).
+    """
+    stem, extension = os.path.splitext(path)
+    output_path = output_path or f'{stem}.local{extension}'
+
+    urls = {}
+    for row in read_rows(path):
+        for column in columns:
+            urls.update(dict.fromkeys(split_images(row.get(column))))
+    log(f"Downloading {len(urls)} images to {store.root}...")
+    stored = store.fetch_many(urls)
+
+    with open_sink(output_path) as sink:
+        for row in read_rows(path):
+            for column in columns:
+                if column in row and split_images(row[column]):
+                    # Two URLs of one image become the same file, listed once
+                    row[column] = ", ".join(dict.fromkeys(
+                        store.location(stored[url], base_url) if stored.get(url) else url
+                        for url in split_images(row[column])))
+            sink.write(row)
+    log(f"✅ {store.downloaded} new images stored, {len(store.errors)} failed -> {output_path}")
+    return output_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m scraper_core.image_store',
+        description="Download the product images of exported files into a content-addressed store "
+                    "and write copies of the exports that point at them.",
+    )
+    parser.add_argument('exports', nargs='+', help=f"exported files ({', '.join(SINKS)})")
+    parser.add_argument('--dir', default=DEFAULT_IMAGE_DIR, help="image store directory (default: images)")
+    parser.add_argument('--base-url', help="public URL the store is served from, e.g. a CDN (default: local paths)")
+    parser.add_argument('--concurrency', type=int, default=8, help="downloads in parallel")
+    args = parser.parse_args(argv)
+
+    store = ImageStore(args.dir, concurrency=args.concurrency)
+    try:
+        for path in args.exports:
+            localize_export(path, store, base_url=args.base_url)
+    finally:
+        store.close()
+    for url, error in store.errors.items():
+        print(f"❌ {url}: {error}")
+    return 1 if store.errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,219 @@
+import re
+import threading
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+import requests
+
+from .concurrency import map_bounded
+from .http_client import get_client
+
+
+# Query parameters and file-name suffixes that only pick a rendition of the same image
+SIZE_PARAMS = {'width', 'height', 'w', 'h', 'crop', 'v', 'resize', 'fit', 'quality', 'q'}
+WIDTH_PARAMS = {'width', 'w'}
+SIZE_SUFFIX = re.compile(r'(?:-(\d+)x\d+|_(\d+)x\d*|@(\d)x)(?=\.\w+$)')
+DESCRIPTOR = re.compile(r'^(\d+(?:\.\d+)?)([wx])$')
+
+
+def parse_srcset(value):
+    """[(url, width or None, density or None)] of a srcset-style "url 165w, url 360w" list.
+
+    A plain URL comes back as a single candidate, so this is safe on `src`
+    values too. Commas inside URLs (Shopify crops, CDN params) are kept.
+    """
+    candidates = []
+    for part in re.split(r'(?<=\d[wx]),\s*|,\s+', (value or '').strip()):
+        pieces = part.strip().rstrip(',').split()
+        if not pieces:
+            continue
+        width = density = None
+        if len(pieces) > 1:
+            match = DESCRIPTOR.match(pieces[-1])
+            if match:
+                number = float(match.group(1))
+                width, density = (int(number), None) if match.group(2) == 'w' else (None, number)
+        candidates.append((pieces[0], width, density))
+    return candidates
+
+
+def pick_candidate(value, max_width=None):
+    """(url, width or None, density or None) of the largest srcset candidate, see `best_candidate`."""
+    candidates = parse_srcset(value)
+    if not candidates:
+        return value, None, None
+    if max_width:
+        fitting = [c for c in candidates if c[1] is None or c[1] <= max_width]
+        candidates = fitting or candidates
+    return max(candidates, key=lambda c: (c[1] or 0, c[2] or 1))
+
+
+def best_candidate(value, max_width=None):
+    """Largest candidate of a srcset (up to `max_width` pixels when given); plain URLs pass through."""
+    return pick_candidate(value, max_width)[0]
+
+
+def rendition_size(url, width=None, density=None):
+    """(width or None, density) of one rendition: the srcset descriptor when known, else what the URL says.
+
+    ?width=800 / ?w=800, file-name suffixes like -800x600, _800x and @2x are read.
+    """
+    parts = urlsplit(url)
+    if width is None:
+        for key, value in parse_qsl(parts.query):
+            if key.lower() in WIDTH_PARAMS and value.isdigit():
+                width = int(value)
+                break
+    match = SIZE_SUFFIX.search(parts.path)
+    if match:
+        if width is None and (match.group(1) or match.group(2)):
+            width = int(match.group(1) or match.group(2))
+        if density is None and match.group(3):
+            density = float(match.group(3))
+    return width, density or 1
+
+
+def first_candidate(value):
+    """First URL of a srcset-style "url 165w, url 360w" list."""
+    candidates = parse_srcset(value)
+    return candidates[0][0] if candidates else value
+
+
+def https_url(value):
+    if not value:
+        return value
+    if value.startswith('//'):
+        return f'https:{value}'
+    if value.startswith('http://'):
+        return value.replace('http://', 'https://', 1)
+    if not value.startswith(('https://', 'data:')):
+        return f'https://{value}'
+    return value
+
+
+def normalize_image_url(url, base_url=None):
+    """Absolute https URL of an image, or None for placeholders (data: URIs, empty values).
+
+    Root-relative paths are resolved against `base_url` when one is given.
+    """
+    url = (url or '').strip()
+    if not url or url.startswith('data:'):
+        return None
+    if base_url and url.startswith('/') and not url.startswith('//'):
+        url = urljoin(base_url, url)
+    return https_url(url)
+
+
+def is_valid_image_url(url):
+    """True for http(s) URLs; inline data: placeholders and empty values are not images."""
+    return bool(url) and url.startswith(('http://', 'https://', '//'))
+
+
+def canonical_image_url(url):
+    """Key that is equal for every rendition of one image (size params and -300x200 suffixes dropped)."""
+    parts = urlsplit(https_url(url))
+    path = SIZE_SUFFIX.sub('', parts.path)
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if k.lower() not in SIZE_PARAMS))
+    return urlunsplit(('https', parts.netloc.lower(), path, query, ''))
+
+
+class ImageStage:
+    """Post-processing of product image URLs for a whole run.
+
+    `clean(values)` picks the best srcset candidate of every value, drops
+    placeholders and collapses renditions of one image to the largest one
+    seen for it so far, across all products of the run, so later stages
+    see each image once. A rendition only replaces the stored one when it
+    is larger (and still within `max_width`); rows already written keep
+    the URL they were given. `validate(urls)` checks URLs in bulk with concurrent HEAD
+    requests over the pooled HTTP client. Each canonical image is checked
+    only once per run, and its status, content type and size end up in
+    `info`.
+    """
+
+    def __init__(self, base_url=None, max_width=None, client=None, concurrency=8):
+        self.base_url = base_url
+        self.max_width = max_width
+        self.client = client
+        self.concurrency = concurrency
+        self.info = {}
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def clean(self, values):
+        keys = []
+        for value in values:
+            url, width, density = pick_candidate(value, self.max_width)
+            url = normalize_image_url(url, self.base_url)
+            if not url:
+                continue
+            key = canonical_image_url(url)
+            rank = self.rank(url, width, density)
+            with self._lock:
+                seen = self._seen.get(key)
+                if seen is None or rank > seen[0]:
+                    self._seen[key] = (rank, url)
+            if key not in keys:
+                keys.append(key)
+        with self._lock:
+            return [self._seen[key][1] for key in keys]
+
+    def rank(self, url, width=None, density=None):
+        width, density = rendition_size(url, width, density)
+        if width is None:
+            # No size anywhere usually means the original upload, the largest there is
+            width = -1 if self.max_width else float('inf')
+        elif self.max_width and width > self.max_width:
+            width = -2
+        return width, density
+
+    def process(self, card, details, check=False):
+        """Card and details with cleaned (and with `check`, reachable) image URLs; returns new dicts."""
+        images = self.clean(details.get('images') or [])
+        # The listing's single image field holds "No image available" when the card had none
+        card_image = card.get('image') or ''
+        card_images = self.clean([card_image]) if not card_image.startswith('No ') else []
+        if check:
+            images = self.valid(images)
+            card_images = self.valid(card_images)
+        if 'image' in card:
+            card = dict(card, image=card_images[0] if card_images else 'No image available')
+        return card, dict(details, images=images)
+
+    def validate(self, urls):
+        """{url: info} for `urls`; info is a dict with ok, status, content_type and size."""
+        with self._lock:
+            todo = [url for url in dict.fromkeys(urls) if url not in self.info]
+        if todo:
+            results = map_bounded(self.check, todo, self.concurrency)
+            with self._lock:
+                self.info.update(zip(todo, results))
+        with self._lock:
+            return {url: self.info[url] for url in urls}
+
+    def valid(self, urls):
+        """The URLs of `urls` that answer with an image."""
+        checked = self.validate(urls)
+        return [url for url in urls if checked[url]['ok']]
+
+    def check(self, url):
+        client = self.client or get_client()
+        try:
+            response = client.head(url)
+            if response.status_code in (403, 405, 501):
+                # Some CDNs refuse HEAD; one byte of the body tells the same
+                response = client.get(url, headers={'Range': 'bytes=0-0'}, stream=True)
+                response.close()
+        except requests.exceptions.RequestException as e:
+            return {'url': url, 'ok': False, 'status': None, 'content_type': None, 'size': None,
+                    'error': type(e).__name__}
+
+        content_type = (response.headers.get('Content-Type') or '').split(';')[0].strip() or None
+        size = response.headers.get('Content-Length')
+        content_range = response.headers.get('Content-Range') or ''
+        if '/' in content_range:
+            size = content_range.rsplit('/', 1)[1]
+        size = int(size) if size and size.isdigit() else None
+        ok = response.status_code < 400 and (content_type or 'image/').startswith('image/')
+        return {'url': url, 'ok': ok, 'status': response.status_code, 'content_type': content_type, 'size': size,
+                'error': None}
@@ -0,0 +1,168 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+
+# Set to 1 to write a <output>.timings.json report next to every scrape's output
+TIMINGS_ENV = 'SCRAPER_TIMINGS'
+
+
+def timings_from_env():
+    return os.environ.get(TIMINGS_ENV, '').lower() in ('1', 'true', 'yes', 'on')
+
+
+def timings_path_for(output_path):
+    return os.path.splitext(output_path)[0] + '.timings.json'
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    rank = min(len(ordered), max(1, math.ceil(fraction * len(ordered))))
+    return ordered[rank - 1]
+
+
+class _Span:
+    __slots__ = ('recorder', 'name', 'started')
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.recorder.add(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class Recorder:
+    """Collects stage timings (spans) and counters for one run.
+
+    Stages are dotted names ("listing.load_more", "detail.http", ...); every
+    span adds one duration to its stage. Safe to use from worker threads.
+    `report()` gives per-stage totals and p50/p95/p99 latencies.
+    """
+
+    enabled = True
+
+    def __init__(self, **meta):
+        self.meta = meta
+        self.started = time.perf_counter()
+        self.spans = defaultdict(list)
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    def span(self, name):
+        return _Span(self, name)
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.spans[name].append(seconds)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def report(self):
+        wall_time = time.perf_counter() - self.started
+        with self._lock:
+            spans = {name: sorted(durations) for name, durations in self.spans.items()}
+            counters = dict(self.counters)
+        stages = {}
+        for name, durations in sorted(spans.items()):
+            total = sum(durations)
+            stages[name] = {
+                'count': len(durations),
+                'total': round(total, 6),
+                'share': round(total / wall_time, 4) if wall_time else None,
+                'mean': round(total / len(durations), 6),
+                'p50': round(percentile(durations, 0.50), 6),
+                'p95': round(percentile(durations, 0.95), 6),
+                'p99': round(percentile(durations, 0.99), 6),
+                'max': round(durations[-1], 6),
+            }
+        # Stages run in parallel and nest ("detail.fetch" holds "detail.http"), so shares can add up past 1
+        return dict(self.meta, wall_time=round(wall_time, 6), stages=stages, counters=counters)
+
+    def write(self, path):
+        """Write `report()` as JSON, through a temp file so readers never see half a report."""
+        temp_path = path + '.part'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, path)
+        return path
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class NullRecorder:
+    """Stand-in while nothing is being recorded: every call is a no-op."""
+
+    enabled = False
+    _span = _NullSpan()
+
+    def span(self, name):
+        return self._span
+
+    def add(self, name, seconds):
+        pass
+
+    def count(self, name, n=1):
+        pass
+
+
+NULL_RECORDER = NullRecorder()
+_active = NULL_RECORDER
+
+
+def active():
+    return _active
+
+
+def span(name):
+    """`with span("stage"):` times the block into the active recorder (free when none is active)."""
+    return _active.span(name)
+
+
+def count(name, n=1):
+    _active.count(name, n)
+
+
+@contextmanager
+def recording(path=None, **meta):
+    """Record everything inside the block and write the report to `path`.
+
+    The recorder is process-wide, so spans in worker threads land in it too.
+    Without `path` this is a no-op that yields whatever recorder is already
+    active, so a caller that records a whole run is not cut short by the
+    code it calls. `meta` goes into the report; more can be added to the
+    recorder's `meta` dict while the block runs (check `enabled` first).
+    """
+    global _active
+    if path is None:
+        yield _active
+        return
+
+    previous, recorder = _active, Recorder(**meta)
+    _active = recorder
+    try:
+        yield recorder
+    finally:
+        _active = previous
+        recorder.write(path)
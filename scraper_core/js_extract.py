@@ -0,0 +1,94 @@
+import json
+
+from soupsieve import escape as css_escape
+
+
+# Runs in the page. arguments[0] = {"card": css, "start": n, "fields": [[name, css, how], ...]}
+# where `how` is "text" (like get_text(strip=True)), "words" (the same joined
+# with spaces), "raw" (textContent trimmed) or "@attr". Cards before index
+# `start` are skipped. Returns one JSON string: an array of per-card value arrays.
+# Selectors arrive complete and already escaped (see `css_for`), so they are
+# used as is; escaping them again here would break the backslashes.
+EXTRACT_JS = """
+const spec = arguments[0];
+function strippedText(el, separator) {
+  const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+  const parts = [];
+  for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+    const part = node.nodeValue.trim();
+    if (part) parts.push(part);
+  }
+  return parts.join(separator);
+}
+function valueOf(card, css, how) {
+  const el = css ? card.querySelector(css) : card;
+  if (!el) return null;
+  if (how === 'text') return strippedText(el, '');
+  if (how === 'words') return strippedText(el, ' ');
+  if (how === 'raw') return el.textContent.trim();
+  return el.getAttribute(how.slice(1));
+}
+const rows = [];
+for (const card of Array.prototype.slice.call(document.querySelectorAll(spec.card), spec.start || 0)) {
+  rows.push(spec.fields.map(([name, css, how]) => valueOf(card, css, how)));
+}
+return JSON.stringify(rows);
+"""
+
+
+def css_for(tag, css_class=''):
+    r"""`div` + `product item` -> `div.product.item`.
+
+    Class names are escaped, so utility classes typed into the GUI still
+    make a valid selector for both soupsieve and `querySelectorAll`:
+
+    >>> print(css_for('div', 'md:flex w-1/2 2xl'))
+    div.md\:flex.w-1\/2.\32 xl
+    """
+    classes = ''.join('.' + css_escape(c) for c in (css_class or '').split())
+    return (tag or '') + classes or '*'
+
+
+class ExtractionSpec:
+    """Card selector plus named fields, compiled once into the argument for `EXTRACT_JS`."""
+
+    def __init__(self, card_css, fields):
+        self.card_css = card_css
+        self.fields = list(fields)
+
+    @property
+    def names(self):
+        return [name for name, _, _ in self.fields]
+
+    def as_argument(self, start=0):
+        return {'card': self.card_css, 'start': start, 'fields': [list(field) for field in self.fields]}
+
+    def cache_variant(self):
+        return 'js:' + json.dumps(self.as_argument(), sort_keys=True, separators=(',', ':'))
+
+
+def spec_from_selectors(selectors):
+    """Spec for the tag/class dict built by the scrapingtool1 GUI (Name, Price, Link per card)."""
+    title_css = css_for(selectors['title_tag'], selectors['title_class'])
+    return ExtractionSpec(
+        css_for(selectors['products_tag'], selectors['products_class']),
+        [
+            ('Name', f'{title_css} a', 'text'),
+            ('Price', css_for(selectors['price_tag'], selectors['price_class']), 'raw'),
+            ('Link', f'{title_css} a', '@href'),
+        ],
+    )
+
+
+def extract_json(driver, spec, start=0):
+    """Run the extraction in the browser; returns the compact JSON string."""
+    return driver.execute_script(EXTRACT_JS, spec.as_argument(start))
+
+
+def records_from_json(payload, spec):
+    return [dict(zip(spec.names, row)) for row in json.loads(payload)]
+
+
+def extract_records(driver, spec, start=0):
+    """List of {field name: value} dicts, one per card from index `start` on; missing elements come back as None."""
+    return records_from_json(extract_json(driver, spec, start), spec)
@@ -0,0 +1,178 @@
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from . import instrument
+
+
+# Counts in-flight fetch/XHR requests and records when the DOM or the network
+# last changed, so Python can tell when a "Load More" round has settled.
+INSTALL_PROBE_JS = """
+if (!window.__scraperProbe) {
+    const probe = window.__scraperProbe = {
+        inflight: 0, lastMutation: performance.now(), lastNetwork: performance.now()
+    };
+    const done = () => { probe.inflight = Math.max(0, probe.inflight - 1); probe.lastNetwork = performance.now(); };
+    if (window.fetch) {
+        const originalFetch = window.fetch;
+        window.fetch = function () {
+            probe.inflight++;
+            return originalFetch.apply(this, arguments).finally(done);
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        probe.inflight++;
+        this.addEventListener('loadend', done);
+        return originalSend.apply(this, arguments);
+    };
+    new MutationObserver(() => { probe.lastMutation = performance.now(); })
+        .observe(document.body, {childList: true, subtree: true});
+}
+"""
+
+PAGE_STATE_JS = """
+const probe = window.__scraperProbe;
+const now = performance.now();
+return {
+    count: document.querySelectorAll(arguments[0]).length,
+    inflight: probe ? probe.inflight : 0,
+    quiet: probe ? now - Math.max(probe.lastMutation, probe.lastNetwork) : 1e9
+};
+"""
+
+
+class AdaptiveTimeout:
+    """Timeout that follows how fast the site has actually been responding.
+
+    Keeps an exponential moving average of observed load times and allows
+    `factor` times that, clamped to [minimum, maximum]. Until the first
+    observation the `initial` value is used.
+    """
+
+    def __init__(self, initial=10.0, minimum=2.0, maximum=30.0, factor=3.0, alpha=0.3):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.factor = factor
+        self.alpha = alpha
+        self.average = None
+
+    def observe(self, seconds):
+        if self.average is None:
+            self.average = seconds
+        else:
+            self.average = self.alpha * seconds + (1 - self.alpha) * self.average
+
+    @property
+    def value(self):
+        if self.average is None:
+            return self.initial
+        return min(self.maximum, max(self.minimum, self.average * self.factor))
+
+
+def page_state(driver, item_selector):
+    return driver.execute_script(PAGE_STATE_JS, item_selector)
+
+
+def find_load_more(driver, button_selector):
+    for button in driver.find_elements(By.CSS_SELECTOR, button_selector):
+        try:
+            if button.is_displayed() and button.is_enabled():
+                return button
+        except Exception:
+            continue
+    return None
+
+
+def wait_for_growth(driver, item_selector, previous_count, timeout):
+    """Block until more than `previous_count` items match, or give up after `timeout`."""
+    def grown(d):
+        count = page_state(d, item_selector)['count']
+        return count if count > previous_count else False
+
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=0.1).until(grown)
+    except TimeoutException:
+        return previous_count
+
+
+def wait_for_settle(driver, item_selector, timeout, quiet_ms=300):
+    """Block until no request is in flight and the DOM has been quiet for `quiet_ms`."""
+    def settled(d):
+        state = page_state(d, item_selector)
+        return state if state['inflight'] == 0 and state['quiet'] >= quiet_ms else False
+
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=0.1).until(settled)['count']
+    except TimeoutException:
+        return page_state(driver, item_selector)['count']
+
+
+def load_all(driver, item_selector, button_selector, timeout=None, on_page=None, log=print, max_pages=1000):
+    """Click "Load More" until the listing stops growing; returns the final item count.
+
+    Each round waits for the item count to grow and the page to settle, so the
+    loop runs as fast as the site answers. It stops as soon as the button is
+    gone or a click adds nothing. It never waits out a fixed timeout at the end.
+    `on_page(count)` is called once the first page has settled and after every
+    round that added items, so callers can start on new items right away.
+    """
+    timeout = timeout or AdaptiveTimeout()
+    driver.execute_script(INSTALL_PROBE_JS)
+    count = wait_for_settle(driver, item_selector, timeout.value)
+    if on_page:
+        on_page(count)
+
+    for _ in range(max_pages):
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        button = find_load_more(driver, button_selector)
+        if button is None:
+            # The button is sometimes rendered lazily once the page bottom is in view
+            wait_for_settle(driver, item_selector, timeout.minimum)
+            button = find_load_more(driver, button_selector)
+        if button is None:
+            break
+
+        started = time.monotonic()
+        driver.execute_script("arguments[0].click();", button)
+        if log:
+            log("Clicked 'Load More'...")
+
+        # One "Load More" round, from the click until the new items have settled
+        with instrument.span('listing.load_more.round'):
+            grown = wait_for_growth(driver, item_selector, count, timeout.value)
+            if grown <= count and page_state(driver, item_selector)['inflight']:
+                # A slow response is still on its way; allow up to the hard maximum
+                grown = wait_for_growth(driver, item_selector, count, timeout.maximum)
+            added = grown > count
+            if added:
+                count = wait_for_settle(driver, item_selector, timeout.value)
+        if not added:
+            break
+        timeout.observe(time.monotonic() - started)
+        if on_page:
+            on_page(count)
+
+    if log:
+        log("All products loaded.")
+    return count
+
+
+def scroll_all(driver, item_selector, timeout=None, max_rounds=200):
+    """Infinite-scroll counterpart of `load_all`: scroll to the bottom until no new items appear."""
+    timeout = timeout or AdaptiveTimeout()
+    driver.execute_script(INSTALL_PROBE_JS)
+    count = wait_for_settle(driver, item_selector, timeout.value)
+
+    for _ in range(max_rounds):
+        started = time.monotonic()
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        grown = wait_for_growth(driver, item_selector, count, timeout.value)
+        if grown <= count:
+            break
+        count = wait_for_settle(driver, item_selector, timeout.value)
+        timeout.observe(time.monotonic() - started)
+    return count
@@ -0,0 +1,179 @@
+import os
+from functools import lru_cache
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+from . import instrument
+
+try:
+    import lxml  # noqa: F401
+    HAVE_LXML = True
+except ImportError:
+    HAVE_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+
+BACKENDS = ('lxml', 'html.parser', 'selectolax')
+
+
+def available_backends():
+    return [b for b in BACKENDS if (b != 'lxml' or HAVE_LXML) and (b != 'selectolax' or SelectolaxParser)]
+
+
+def default_backend():
+    """SCRAPER_PARSER when it names an installed backend, else lxml, else html.parser."""
+    backend = os.environ.get('SCRAPER_PARSER')
+    if backend in available_backends():
+        return backend
+    return 'lxml' if HAVE_LXML else 'html.parser'
+
+
+class CardStrainer(SoupStrainer):
+    """Restricted parse that only builds product-card subtrees (plus `extra_tags`).
+
+    Everything outside `<card_tag class="... card_class ...">` is skipped while
+    parsing, so a multi-megabyte listing becomes a small tree. Works with
+    both the pre-4.13 and the current BeautifulSoup strainer API.
+
+    Not used by the scrapers: the strainer check runs in Python for every tag,
+    which costs about what it saves. On the bench_parsing listings it is
+    slower than a full parse with html.parser and no faster overall with
+    lxml, so listings are parsed whole. Kept for the benchmark.
+    """
+
+    def __init__(self, card_tag, card_class, extra_tags=('h2',)):
+        super().__init__(card_tag)
+        self.card_tag = card_tag
+        self.card_class = card_class
+        self.extra_tags = set(extra_tags)
+
+    def wanted(self, name, attrs):
+        if name in self.extra_tags:
+            return True
+        if name != self.card_tag:
+            return False
+        classes = (attrs or {}).get('class') or ''
+        if isinstance(classes, str):
+            classes = classes.split()
+        return not self.card_class or self.card_class in classes
+
+    # BeautifulSoup >= 4.13
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self.wanted(name, attrs)
+
+    def allow_string_creation(self, string):
+        return False
+
+    # BeautifulSoup < 4.13
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        if hasattr(markup_name, 'attrs'):
+            return markup_name if self.wanted(markup_name.name, markup_name.attrs) else None
+        return markup_name if self.wanted(markup_name, markup_attrs) else None
+
+    def search(self, markup):
+        if isinstance(markup, str):
+            return None
+        return super().search(markup)
+
+
+def make_soup(html, backend=None, only=None):
+    """BeautifulSoup tree using the fastest installed builder, optionally restricted by a strainer."""
+    if backend is None:
+        backend = default_backend()
+        if backend == 'selectolax':
+            # SCRAPER_PARSER=selectolax only applies where a non-soup tree will do
+            backend = 'lxml'
+    if backend == 'lxml' and not HAVE_LXML:
+        backend = 'html.parser'
+    if backend not in ('lxml', 'html.parser'):
+        raise ValueError(f"{backend!r} does not build BeautifulSoup trees; use parse_html() instead")
+    with instrument.span('parse.html'):
+        return BeautifulSoup(html, backend, parse_only=only)
+
+
+class Selector:
+    """CSS selector compiled once and reused for every card and page.
+
+    BeautifulSoup trees are matched with the precompiled soupsieve pattern;
+    selectolax takes the selector text. Invalid CSS raises ValueError when
+    the selector is compiled, not halfway through a scrape.
+    """
+
+    def __init__(self, css):
+        self.css = css
+        try:
+            self.pattern = soupsieve.compile(css)
+        except soupsieve.SelectorSyntaxError as e:
+            raise ValueError(f"Invalid CSS selector {css!r}: {str(e).splitlines()[0]}") from None
+
+    def __repr__(self):
+        return f'Selector({self.css!r})'
+
+
+@lru_cache(maxsize=512)
+def compile_css(css):
+    return Selector(css)
+
+
+class Node:
+    """Backend-neutral element: `select`, `select_one`, `text` and `attr`."""
+
+    def __init__(self, element, selectolax=False):
+        self.element = element
+        self.selectolax = selectolax
+
+    def select(self, css):
+        """Matching descendants; `css` is a selector string or a compiled `Selector`."""
+        if self.selectolax:
+            return [Node(e, True) for e in self.element.css(getattr(css, 'css', css))]
+        if isinstance(css, Selector):
+            return [Node(e) for e in css.pattern.select(self.element)]
+        return [Node(e) for e in self.element.select(css)]
+
+    def select_one(self, css):
+        if self.selectolax:
+            element = self.element.css_first(getattr(css, 'css', css))
+        elif isinstance(css, Selector):
+            element = css.pattern.select_one(self.element)
+        else:
+            element = self.element.select_one(css)
+        return Node(element, self.selectolax) if element is not None else None
+
+    def text(self, separator='', strip=True):
+        if self.selectolax:
+            return self.element.text(separator=separator, strip=strip)
+        return self.element.get_text(separator=separator, strip=strip)
+
+    def attr(self, name, default=None):
+        if self.selectolax:
+            value = self.element.attributes.get(name)
+        else:
+            value = self.element.get(name)
+            if isinstance(value, list):
+                value = ' '.join(value)
+        return default if value is None else value
+
+
+def parse_html(html, backend=None, only=None):
+    """Parse with any backend in BACKENDS and return the root as a `Node`.
+
+    `only` (a strainer) applies to the BeautifulSoup backends; selectolax
+    builds its tree in C and does not need one.
+    """
+    backend = backend or default_backend()
+    if backend == 'selectolax':
+        if SelectolaxParser is None:
+            raise ImportError("selectolax is not installed")
+        if isinstance(html, bytes):
+            html = html.decode('utf-8', errors='replace')
+        with instrument.span('parse.html'):
+            return Node(SelectolaxParser(html), selectolax=True)
+    return Node(make_soup(html, backend, only))
@@ -0,0 +1,177 @@
+import json
+import os
+from urllib.parse import urlsplit
+
+from ..parsing import compile_css
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+# A site profile describes everything site specific about a scrape as plain
+# data, so one engine can handle every supported shop. Profiles live in
+# JSON (or, with PyYAML installed, YAML) files next to this module; more
+# directories can be listed in SCRAPER_PROFILES (os.pathsep separated).
+#
+#   domains          hosts the profile is picked for (subdomains included)
+#   listing.mode     "load_more" (browser, clicks `load_more` until done),
+#                    "scroll" (browser, infinite scroll) or
+#                    "http" (plain requests, browser only as a fallback)
+#   listing.fields   name -> [css inside the card, how, optional transforms]
+#                    where `how` is "text", "words", "raw" or "@attribute"
+#                    (see scraper_core.js_extract) and transforms are names
+#                    from scraper_core.engine.TRANSFORMS
+#   detail.mode      "browser" (rendered page) or "http"
+#   detail.wait_for  css the browser waits for before reading the page
+#   detail.title     css of the product name, used when scraping bare product URLs
+#   detail.images    [css, how] for every product image on the detail page
+#   detail.description  css of the description block
+#   columns          output column -> card/detail field, in output order
+#   constants        extra output columns with a fixed value
+#   placeholders     field -> text written when the field came out empty
+#                    (default "No <field> available", no images: empty)
+#
+# Every selector is compiled when the profile is loaded, so a typo fails
+# here instead of halfway through a scrape.
+
+PROFILES_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILE_EXTENSIONS = ('.json', '.yaml', '.yml')
+LISTING_MODES = ('load_more', 'scroll', 'http')
+DETAIL_MODES = ('browser', 'http')
+FIELD_HOWS = ('text', 'words', 'raw')
+
+
+def check_css(source, where, css):
+    if not isinstance(css, str) or not css.strip():
+        raise ValueError(f"{source}: {where} must be a CSS selector")
+    try:
+        compile_css(css)
+    except ValueError as e:
+        raise ValueError(f"{source}: {where}: {e}") from None
+
+
+def check_how(source, where, how):
+    if how not in FIELD_HOWS and not (isinstance(how, str) and how.startswith('@') and len(how) > 1):
+        raise ValueError(f"{source}: {where} must be one of {', '.join(FIELD_HOWS)} or '@attribute', not {how!r}")
+
+
+def validate_profile(profile, source='profile'):
+    """Raise ValueError describing the first problem in `profile`; returns it unchanged."""
+    for key in ('name', 'domains', 'base_url', 'listing', 'detail', 'columns'):
+        if key not in profile:
+            raise ValueError(f"{source}: missing {key!r}")
+    source = f"{source} ({profile['name']})"
+
+    listing = profile['listing']
+    if listing.get('mode') not in LISTING_MODES:
+        raise ValueError(f"{source}: listing.mode must be one of {', '.join(LISTING_MODES)}")
+    check_css(source, 'listing.card', listing.get('card'))
+    if listing['mode'] == 'load_more':
+        check_css(source, 'listing.load_more', listing.get('load_more'))
+    if listing.get('category'):
+        check_css(source, 'listing.category', listing['category'])
+    if 'link' not in listing.get('fields', {}):
+        raise ValueError(f"{source}: listing.fields needs a 'link' field")
+    for name, field in listing['fields'].items():
+        if not isinstance(field, list) or not 2 <= len(field) <= 3:
+            raise ValueError(f"{source}: listing.fields.{name} must be [css, how] or [css, how, transforms]")
+        if field[0]:
+            check_css(source, f'listing.fields.{name}', field[0])
+        check_how(source, f'listing.fields.{name}', field[1])
+
+    detail = profile['detail']
+    if detail.get('mode') not in DETAIL_MODES:
+        raise ValueError(f"{source}: detail.mode must be one of {', '.join(DETAIL_MODES)}")
+    for key in ('wait_for', 'title', 'description'):
+        if detail.get(key):
+            check_css(source, f'detail.{key}', detail[key])
+    if detail.get('images'):
+        check_css(source, 'detail.images', detail['images'][0])
+        check_how(source, 'detail.images', detail['images'][1] if len(detail['images']) > 1 else None)
+    for name, text in profile.get('placeholders', {}).items():
+        if not isinstance(text, str):
+            raise ValueError(f"{source}: placeholders.{name} must be a string")
+    return profile
+
+
+def load_profile(path):
+    """Read and validate one profile file."""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.json'):
+            profile = json.load(f)
+        elif yaml is not None:
+            profile = yaml.safe_load(f)
+        else:
+            raise ImportError(f"PyYAML is needed to read {path}")
+    return validate_profile(profile, os.path.basename(path))
+
+
+def load_profiles(directory):
+    """Every profile file in `directory`, by name."""
+    profiles = {}
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(PROFILE_EXTENSIONS):
+            if filename.endswith(('.yaml', '.yml')) and yaml is None:
+                continue
+            profile = load_profile(os.path.join(directory, filename))
+            profiles[profile['name']] = profile
+    return profiles
+
+
+# The built-in shops, for callers that always scrape the same one
+BUILTIN_PROFILES = {'LAPTOPENGINE': 'laptopengine', 'REVIBE': 'revibe'}
+
+_profiles = None
+
+
+def all_profiles():
+    """Every known profile by name, read from the profile files on first use.
+
+    Importing this module never touches the filesystem, so a frozen app
+    that does not bundle the profile files can still import it.
+    """
+    global _profiles
+    if _profiles is None:
+        profiles = load_profiles(PROFILES_DIR)
+        for directory in filter(None, os.environ.get('SCRAPER_PROFILES', '').split(os.pathsep)):
+            profiles.update(load_profiles(directory))
+        _profiles = profiles
+    return _profiles
+
+
+def __getattr__(name):
+    # PROFILES, LAPTOPENGINE and REVIBE are resolved lazily, see all_profiles()
+    if name == 'PROFILES':
+        return all_profiles()
+    if name in BUILTIN_PROFILES:
+        return get_profile(BUILTIN_PROFILES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def register_profile(profile):
+    """Add (or replace) a profile at runtime, e.g. one built in a GUI."""
+    all_profiles()[profile['name']] = validate_profile(profile)
+    return profile
+
+
+def get_profile(name):
+    profiles = all_profiles()
+    try:
+        return profiles[name]
+    except KeyError:
+        raise ValueError(f"Unknown site profile {name!r}; available: {', '.join(sorted(profiles))}") from None
+
+
+def profile_for_url(url):
+    """Profile whose `domains` match the host of `url`; the most specific domain wins."""
+    host = (urlsplit(url).hostname or '').lower()
+    best, best_length = None, -1
+    for profile in all_profiles().values():
+        for domain in profile['domains']:
+            if (host == domain or host.endswith('.' + domain)) and len(domain) > best_length:
+                best, best_length = profile, len(domain)
+    if best is None:
+        raise ValueError(f"No site profile for {host or url!r}; pass one explicitly")
+    return best
@@ -0,0 +1,51 @@
+from .browser_pool import get_pool
+from .pagination import load_all
+from .parsing import make_soup
+from .qt_worker import ScrapeWorker
+
+
+class LoadMoreWorker(ScrapeWorker):
+    """Scrapes a laptopengine "Load More" listing into [category, title, price, link] rows.
+
+    Shared by the two listing-only GUIs (scrapingtool.py, scrapping-tools.py).
+    The page is opened in a pooled browser and `load_all` clicks "Load More"
+    until the listing stops growing, waiting only as long as the site takes.
+    Pause and cancel take effect between rounds and between parsed cards.
+    """
+
+    columns = ["Category", "Title", "Price", "Link"]
+
+    def __init__(self, url, chromedriver_path):
+        super().__init__()
+        self.url = url
+        self.chromedriver_path = chromedriver_path
+
+    def scrape(self):
+        self.log("Loading products...")
+        with get_pool(self.chromedriver_path).lease() as driver:
+            driver.get(self.url)
+            load_all(driver, 'div.electron-loop-product', '.electron-load-more', log=None, on_page=self.page_loaded)
+            page_source = driver.page_source
+
+        soup = make_soup(page_source)
+        category_tag = soup.find('h2')
+        category = category_tag.get_text(strip=True) if category_tag else 'No category'
+        product_items = soup.find_all('div', class_='electron-loop-product')
+        self.log(f"Parsing {len(product_items)} products...")
+
+        for product in product_items:
+            self.checkpoint()
+            title_tag = product.find('h6', class_='product-name')
+            link_tag = title_tag.find('a') if title_tag else None
+            product_link = link_tag['href'] if link_tag and link_tag.has_attr('href') else 'No link'
+            title = link_tag.get_text(strip=True) if link_tag else 'No title'
+            price_tag = product.find('span', class_='price-item--sale')
+            price = price_tag.text.strip() if price_tag else 'No price'
+
+            self.add_row([category, title, price, product_link])
+
+        return f"Scraping completed! {len(product_items)} products."
+
+    def page_loaded(self, count):
+        self.checkpoint()
+        self.log(f"Loading products... {count} so far")
@@ -0,0 +1,229 @@
+import operator
+import os
+import re
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt, QTimer
+from PyQt6.QtWidgets import QAbstractItemView, QHeaderView, QTableView
+
+from .export import SINKS, open_sink
+
+
+# A number with at most a short currency code or symbol around it: "AED 1,299.00", "$15", "42"
+NUMBER_RE = re.compile(r'[^\d\s-]{0,4}\s*(-?\d[\d,]*(?:\.\d+)?)\s*[^\d\s]{0,4}')
+
+
+def sort_key(value):
+    """Numbers and prices sort by value, everything else case-insensitively after them."""
+    match = NUMBER_RE.fullmatch(value.strip()) if value else None
+    if match:
+        return (0, float(match.group(1).replace(',', '')), '')
+    return (1, 0.0, (value or '').lower())
+
+
+class ColumnStore:
+    """Scraped rows kept column by column.
+
+    Each column is a plain list of strings. Values that repeat down a
+    column (category, "No price", ...) are stored once and shared, so 100k
+    rows cost little more than their distinct text. Rows are addressed by
+    insertion index.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.data = [[] for _ in self.columns]
+        self._shared = [{} for _ in self.columns]
+
+    def __len__(self):
+        return len(self.data[0]) if self.data else 0
+
+    def append(self, row):
+        """Add one row, given as a dict (by column name) or a sequence (by position)."""
+        values = [row.get(column) for column in self.columns] if isinstance(row, dict) else row
+        for data, shared, value in zip(self.data, self._shared, values):
+            value = '' if value is None else str(value)
+            data.append(shared.setdefault(value, value) if len(value) < 64 else value)
+
+    def value(self, row, column):
+        return self.data[column][row]
+
+    def row(self, row):
+        return {name: data[row] for name, data in zip(self.columns, self.data)}
+
+    def rows(self, order=None):
+        for row in (range(len(self)) if order is None else order):
+            yield self.row(row)
+
+    def matches(self, row, needle):
+        """True when any cell of `row` contains the lower-case `needle`."""
+        return any(needle in data[row].lower() for data in self.data)
+
+    def matching_rows(self, needle):
+        """[bool] per row for `matches(row, needle)`, computed column by column.
+
+        Each distinct value is lower-cased and searched once; the per-row work
+        is set lookups done in C.
+        """
+        matched = [False] * len(self)
+        for data in self.data:
+            hits = {value for value in set(data) if needle in value.lower()}
+            if hits:
+                matched = list(map(operator.or_, matched, map(hits.__contains__, data)))
+        return matched
+
+    def clear(self):
+        self.data = [[] for _ in self.columns]
+        self._shared = [{} for _ in self.columns]
+
+    def export(self, path, order=None):
+        """Stream the rows (in `order`, default insertion order) to a .csv/.jsonl/.xlsx file.
+
+        Names without one of those extensions get ".csv" appended. Returns the
+        path written.
+        """
+        if os.path.splitext(path)[1].lower() not in SINKS:
+            path += '.csv'
+        with open_sink(path, columns=self.columns) as sink:
+            sink.write_many(self.rows(order))
+        return path
+
+
+class RecordTableModel(QAbstractTableModel):
+    """Read-only table model over a `ColumnStore`.
+
+    The view only asks for the cells it is about to paint, so nothing is
+    built per cell up front. `append_rows()` inserts a whole batch with one
+    beginInsertRows/endInsertRows pair while a scrape is still running.
+    Sorting is done here, on the column data, by permuting an index list.
+    """
+
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self.store = ColumnStore(columns)
+        self._order = []
+
+    # ✅ Qt model interface
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole) and index.isValid():
+            return self.store.value(self._order[index.row()], index.column())
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.store.columns[section]
+        return section + 1
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if column < 0 or not self._order:
+            return
+        self.layoutAboutToBeChanged.emit()
+        values = self.store.data[column]
+        keys = {value: sort_key(value) for value in set(values)}
+        old_order = self._order
+        self._order = sorted(old_order, key=lambda row: keys[values[row]],
+                             reverse=order == Qt.SortOrder.DescendingOrder)
+        # Keep selections and the current cell on the same records
+        new_position = {row: position for position, row in enumerate(self._order)}
+        old_indexes = self.persistentIndexList()
+        self.changePersistentIndexList(old_indexes, [
+            self.index(new_position[old_order[index.row()]], index.column()) for index in old_indexes
+        ])
+        self.layoutChanged.emit()
+
+    # ✅ Data
+    def append_rows(self, rows):
+        rows = list(rows)
+        if not rows:
+            return
+        first = len(self._order)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        start = len(self.store)
+        for row in rows:
+            self.store.append(row)
+        self._order.extend(range(start, start + len(rows)))
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.store.clear()
+        self._order = []
+        self.endResetModel()
+
+    def record_row(self, row):
+        """Store index of the record shown at model row `row`."""
+        return self._order[row]
+
+    def export(self, path, rows=None):
+        """Write the records (the given model rows, default all in the current order) to `path`."""
+        rows = range(len(self._order)) if rows is None else rows
+        return self.store.export(path, (self._order[row] for row in rows))
+
+
+class RecordFilterProxy(QSortFilterProxyModel):
+    """Case-insensitive "contains" filter over every column of a `RecordTableModel`.
+
+    Matching is computed over the column store in one pass when the search
+    changes, instead of going through `data()` cell by cell. Sorting is handed to the source model, which
+    sorts its column data in one pass.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ''
+        self._matched = []
+
+    def set_search(self, text):
+        self._needle = (text or '').strip().lower()
+        self._matched = self.sourceModel().store.matching_rows(self._needle) if self._needle else []
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._needle:
+            return True
+        model = self.sourceModel()
+        row = model.record_row(source_row)
+        # Rows that streamed in after the search was set are checked one by one
+        return self._matched[row] if row < len(self._matched) else model.store.matches(row, self._needle)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+    def visible_source_rows(self):
+        return [self.mapToSource(self.index(row, 0)).row() for row in range(self.rowCount())]
+
+    def export(self, path):
+        """Write the rows that pass the filter, in the order shown."""
+        return self.sourceModel().export(path, self.visible_source_rows())
+
+
+def make_record_view(proxy, parent=None):
+    """QTableView tuned for large record tables: fixed row heights, no per-row sizing."""
+    view = QTableView(parent)
+    view.setModel(proxy)
+    view.setSortingEnabled(True)
+    view.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
+    view.setWordWrap(False)
+    view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    view.verticalHeader().setDefaultSectionSize(view.fontMetrics().height() + 8)
+    view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+    view.horizontalHeader().setStretchLastSection(True)
+    return view
+
+
+def connect_search(line_edit, proxy, delay_ms=250):
+    """Filter `proxy` by the text of `line_edit` once typing pauses for `delay_ms`."""
+    timer = QTimer(line_edit)
+    timer.setSingleShot(True)
+    timer.setInterval(delay_ms)
+    timer.timeout.connect(lambda: proxy.set_search(line_edit.text()))
+    line_edit.textChanged.connect(timer.start)
+    return timer
@@ -0,0 +1,226 @@
+import threading
+import time
+from collections import deque
+
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtWidgets import QPlainTextEdit
+
+from .concurrency import Cancelled, RunControl
+
+
+def format_duration(seconds):
+    """"1h 02m", "3m 05s", "42s"."""
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def format_stats(stats):
+    """One-line summary of a `stats_signal` payload: "120/480 · 8.5 items/s · ETA 42s"."""
+    text = f"{stats['done']}/{stats['total']}" if stats['total'] else f"{stats['done']}"
+    if stats['rate']:
+        text += f" · {stats['rate']:.1f} items/s"
+    if stats['eta'] is not None:
+        text += f" · ETA {format_duration(stats['eta'])}"
+    return text
+
+
+class Throughput:
+    """Items/sec over the last `window` seconds and the ETA that follows from it.
+
+    A moving window follows the current speed: a slow start (browser
+    warm-up, pagination) stops counting once it has scrolled out.
+    """
+
+    def __init__(self, window=10.0):
+        self.window = window
+        self.started = time.monotonic()
+        self.done = 0
+        self.total = 0
+        self._samples = deque([(self.started, 0)])
+
+    def update(self, done, total):
+        now = time.monotonic()
+        self.done, self.total = done, total
+        self._samples.append((now, done))
+        # Keep one sample older than the window so the rate spans all of it
+        while len(self._samples) > 2 and now - self._samples[1][0] >= self.window:
+            self._samples.popleft()
+
+    def rate(self):
+        (first_time, first_done), (last_time, last_done) = self._samples[0], self._samples[-1]
+        elapsed = last_time - first_time
+        return (last_done - first_done) / elapsed if elapsed > 0 else 0.0
+
+    def stats(self):
+        rate = self.rate()
+        remaining = self.total - self.done
+        return {
+            'done': self.done,
+            'total': self.total,
+            'rate': rate,
+            'eta': remaining / rate if rate > 0 and remaining >= 0 else None,
+            'elapsed': time.monotonic() - self.started,
+        }
+
+
+class ScrapeWorker(QThread):
+    """Base for GUI scrapes: runs `scrape()` off the GUI thread.
+
+    Subclasses implement `scrape()` and return the message for
+    `finished_signal`. Scraped rows go through `add_row()`, log lines
+    through `log()` and progress through `report_progress(done, total)`.
+    None of them emits a signal per call: while `scrape()` runs, a ticker
+    thread sends whatever piled up `frame_rate` times a second, even when
+    the scrape itself is stuck in a long page load. Rows go out as one list
+    on `rows_signal` (sooner once `batch_size` rows are waiting), log lines
+    as one list on `log_signal`, and the latest progress as a percentage
+    on `progress_signal` plus items/sec and ETA on `stats_signal`. At most
+    `max_log_lines` lines are held between frames; older ones are counted
+    and dropped.
+
+    `pause()`, `resume()` and `cancel()` may be called from the GUI thread.
+    The scrape only stops or waits when it calls `checkpoint()` (or
+    `control.sleep()`).
+    """
+
+    rows_signal = pyqtSignal(list)
+    progress_signal = pyqtSignal(int)
+    stats_signal = pyqtSignal(dict)
+    log_signal = pyqtSignal(list)
+    paused_signal = pyqtSignal(bool)
+    finished_signal = pyqtSignal(str)
+
+    def __init__(self, batch_size=200, frame_rate=10, max_log_lines=1000):
+        super().__init__()
+        self.batch_size = batch_size
+        self.frame_interval = 1.0 / frame_rate
+        self.control = RunControl()
+        self.throughput = Throughput()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._rows = []
+        self._lines = deque(maxlen=max_log_lines)
+        self._dropped_lines = 0
+        self._progress_changed = False
+        self._percent = None
+        self._stop_frames = threading.Event()
+
+    def run(self):
+        self._stop_frames.clear()
+        ticker = threading.Thread(target=self._frames, daemon=True)
+        ticker.start()
+        try:
+            message = self.scrape()
+        except Cancelled:
+            message = "⏹ Scrape cancelled."
+        except Exception as e:
+            message = f"❌ Scrape failed: {e}"
+        finally:
+            self._stop_frames.set()
+            ticker.join()
+            self.flush()
+        self.finished_signal.emit(message)
+
+    def _frames(self):
+        while not self._stop_frames.wait(self.frame_interval):
+            self.flush()
+
+    def scrape(self):
+        raise NotImplementedError
+
+    # ✅ Called from the scrape (any thread)
+    def checkpoint(self):
+        self.control.checkpoint()
+
+    def add_row(self, row):
+        with self._lock:
+            self._rows.append(row)
+            full = len(self._rows) >= self.batch_size
+        if full:
+            self.flush()
+
+    def log(self, message):
+        with self._lock:
+            if len(self._lines) == self._lines.maxlen:
+                self._dropped_lines += 1
+            self._lines.append(str(message))
+
+    def report_progress(self, done, total):
+        with self._lock:
+            self.throughput.update(done, total)
+            self._progress_changed = True
+
+    def flush(self):
+        """Send whatever is pending now, frame rate or not."""
+        # Emitted under the lock so batches taken by the ticker and by the
+        # scrape reach the GUI in the order they were taken; the connections
+        # are queued, so no slot runs while the lock is held
+        with self._flush_lock:
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            rows, self._rows = self._rows, []
+            lines = list(self._lines)
+            self._lines.clear()
+            if self._dropped_lines:
+                lines.insert(0, f"… {self._dropped_lines} log lines skipped")
+                self._dropped_lines = 0
+            stats = percent = None
+            if self._progress_changed:
+                self._progress_changed = False
+                stats = self.throughput.stats()
+                # `total` keeps growing while pagination is still running
+                percent = min(100, int(stats['done'] / stats['total'] * 100)) if stats['total'] else 0
+                if percent == self._percent:
+                    percent = None
+                else:
+                    self._percent = percent
+        if rows:
+            self.rows_signal.emit(rows)
+        if lines:
+            self.log_signal.emit(lines)
+        if percent is not None:
+            self.progress_signal.emit(percent)
+        if stats:
+            self.stats_signal.emit(stats)
+
+    # ✅ Called from the GUI
+    def pause(self):
+        self.control.pause()
+        self.paused_signal.emit(True)
+
+    def resume(self):
+        self.control.resume()
+        self.paused_signal.emit(False)
+
+    def toggle_pause(self):
+        self.resume() if self.control.paused else self.pause()
+
+    def cancel(self):
+        self.control.cancel()
+
+
+class LogView(QPlainTextEdit):
+    """Read-only log pane that keeps the last `max_lines` lines.
+
+    `append_lines()` adds a whole `log_signal` batch in one edit, so a
+    frame costs one layout pass however many lines it carries. Older lines
+    fall off the top once the limit is reached.
+    """
+
+    def __init__(self, parent=None, max_lines=5000):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(max_lines)
+
+    def append_lines(self, lines):
+        if lines:
+            self.appendPlainText("\n".join(lines))
+
+    def append(self, text):
+        self.appendPlainText(text)
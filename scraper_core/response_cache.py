@@ -0,0 +1,165 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+DEFAULT_CACHE_PATH = os.path.join('scrape_cache', 'responses.sqlite3')
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid')
+
+
+class CacheMiss(LookupError):
+    """Raised in replay-only mode when a URL was never cached."""
+
+
+def normalize_url(url):
+    """Cache key: lower-case scheme/host, no default port, fragment or tracking params, sorted query."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and not (scheme == 'http' and parts.port == 80) and not (scheme == 'https' and parts.port == 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.startswith(TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, parts.path or '/', urlencode(query), ''))
+
+
+class CachedResponse:
+    def __init__(self, url, status, headers, body):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def text(self):
+        return self.body.decode('utf-8', errors='replace')
+
+
+class ResponseCache:
+    """Persistent response cache keyed by normalized URL.
+
+    Bodies are stored zlib-compressed in one SQLite file. Entries expire
+    after `ttl_by_domain.get(host, default_ttl)` seconds. Once the stored
+    bytes exceed `max_bytes`, the least recently used entries are evicted.
+    With `replay_only` nothing is fetched: expired entries are still served
+    and misses raise `CacheMiss`.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=512 * 1024 * 1024, default_ttl=6 * 3600,
+                 ttl_by_domain=None, replay_only=False):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttl_by_domain = ttl_by_domain or {}
+        self.replay_only = replay_only
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, url TEXT NOT NULL, status INTEGER NOT NULL, headers TEXT NOT NULL,"
+            " body BLOB NOT NULL, size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);"
+        )
+        self._conn.commit()
+
+    def ttl_for(self, url):
+        host = (urlsplit(url).hostname or '').lower()
+        for domain, ttl in self.ttl_by_domain.items():
+            if host == domain or host.endswith('.' + domain):
+                return ttl
+        return self.default_ttl
+
+    @staticmethod
+    def key_for(url, variant=None):
+        key = normalize_url(url)
+        return f"{key}#{variant}" if variant else key
+
+    def get(self, url, variant=None):
+        """Cached response for `url`, or None when missing or expired.
+
+        `variant` keeps differently produced bodies of one URL apart, e.g.
+        the raw HTTP response and the browser-rendered page.
+        """
+        key = self.key_for(url, variant)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, headers, body, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+
+        if row is None or (not self.replay_only and now - row[4] > self.ttl_for(url)):
+            if self.replay_only:
+                raise CacheMiss(url)
+            return None
+        cached_url, status, headers, body, _ = row
+        return CachedResponse(cached_url, status, json.loads(headers), zlib.decompress(body))
+
+    def put(self, url, status, headers, body, variant=None):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        compressed = zlib.compress(body, 6)
+        now = time.time()
+        headers = {k: v for k, v in dict(headers).items() if k.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')}
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.key_for(url, variant), url, status, json.dumps(headers), compressed, len(compressed), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def total_bytes(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at")
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+
+def cache_from_env():
+    """Cache configured by SCRAPER_CACHE=1 / SCRAPER_REPLAY=1 (and SCRAPER_CACHE_PATH), else None."""
+    replay = os.environ.get('SCRAPER_REPLAY') == '1'
+    if not replay and os.environ.get('SCRAPER_CACHE') != '1':
+        return None
+    return ResponseCache(os.environ.get('SCRAPER_CACHE_PATH', DEFAULT_CACHE_PATH), replay_only=replay)
+
+
+def cached_render(url, cache, render, variant='rendered'):
+    """Page source for `url` via `render(url)` (normally Selenium), read from and written to `cache`.
+
+    In replay-only mode the browser is never touched; a miss raises `CacheMiss`.
+    A different `variant` caches other browser output, e.g. in-page extraction results.
+    """
+    if cache is not None:
+        cached = cache.get(url, variant=variant)
+        if cached is not None:
+            return cached.text
+    page_source = render(url)
+    if cache is not None:
+        cache.put(url, 200, {'Content-Type': 'text/html; charset=utf-8'}, page_source, variant=variant)
+    return page_source
@@ -0,0 +1,141 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .browser_pool import DEFAULT_CHROMEDRIVER_PATH
+from .engine import CategoryScraper, build_row
+from .export import open_sink
+from .profiles import get_profile, profile_for_url
+
+
+# Each worker process runs `concurrency + 1` Chrome instances (about 200-300 MB
+# each) when its profile renders in the browser; the default keeps a run to
+# about this many browsers, whatever the CPU count
+MAX_PROCESSES = 4
+BROWSER_BUDGET = 12
+
+
+def default_processes(concurrency=4):
+    """Worker processes to start by default: at most MAX_PROCESSES and the CPU count,
+    fewer when `concurrency` would put more than BROWSER_BUDGET browsers up at once."""
+    by_memory = BROWSER_BUDGET // (concurrency + 1)
+    return max(1, min(os.cpu_count() or 1, MAX_PROCESSES, by_memory))
+
+
+def run_sharded(func, items, processes=None, initializer=None, initargs=()):
+    """Yield `func(item)` for every item, in input order, computed in worker processes.
+
+    Items are handed to workers one at a time as they free up (chunksize 1),
+    so a few slow categories never hold up a fixed share of the list. Each
+    process keeps its own browsers and HTTP session. `func` and
+    `initializer` must be importable top-level functions (or partials of
+    them). With one process everything runs inline.
+    """
+    items = list(items)
+    processes = max(1, min(processes or default_processes(), len(items) or 1))
+    if processes == 1:
+        if initializer:
+            initializer(*initargs)
+        for item in items:
+            yield func(item)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=initializer, initargs=initargs) as pool:
+        yield from pool.map(func, items, chunksize=1)
+
+
+def merged_columns(profiles, skip_fields=()):
+    """Output columns of several profiles, in first-seen order, without those filled from `skip_fields`."""
+    columns = []
+    for profile in profiles:
+        skipped = [column for column, field in profile['columns'].items() if field in skip_fields]
+        for column in list(profile['columns']) + list(profile.get('constants', {})):
+            if column not in columns and column not in skipped:
+                columns.append(column)
+    return columns
+
+
+def merge_outputs(paths, output_path, columns):
+    """Concatenate JSON Lines shard files into one output (any sink format); returns the row count."""
+    with open_sink(output_path, columns=columns) as sink:
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        row = json.loads(line)
+                        sink.write({column: row.get(column, '') for column in columns})
+    return sink.count
+
+
+# ✅ Product URL workers: one scraper (browser pool + HTTP session) per process and profile
+_worker_options = {}
+_worker_scrapers = {}
+
+
+def init_product_worker(options):
+    _worker_options.clear()
+    _worker_options.update(options)
+    _worker_scrapers.clear()
+
+
+def profile_for(url, profile_name=None):
+    return get_profile(profile_name) if profile_name else profile_for_url(url)
+
+
+def profiles_for(urls, profile_name=None):
+    """Distinct profiles of `urls`; URLs without one are skipped (their workers report the error)."""
+    profiles = []
+    for url in urls:
+        try:
+            profile = profile_for(url, profile_name)
+        except ValueError:
+            continue
+        if profile not in profiles:
+            profiles.append(profile)
+    return profiles
+
+
+def scrape_product(url):
+    """Detail page -> {'url', 'row', 'error'}; runs inside a worker process."""
+    try:
+        profile = profile_for(url, _worker_options.get('profile'))
+        scraper = _worker_scrapers.get(profile['name'])
+        if scraper is None:
+            scraper = _worker_scrapers[profile['name']] = CategoryScraper(
+                url, profile,
+                concurrency=1,
+                chromedriver_path=_worker_options.get('chromedriver', DEFAULT_CHROMEDRIVER_PATH),
+                headless=_worker_options.get('headless', True),
+                check_images=_worker_options.get('check_images', False),
+                log=None,
+            )
+        details = scraper.fetch_details(url)
+        defaults = {name: f'No {name} available' for name in profile['listing']['fields']}
+        card = dict(defaults, title=details.get('title', 'No title available'), link=url)
+        card, details = scraper.process_images(card, details)
+        return {'url': url, 'row': build_row(profile, None, card, details), 'error': None}
+    except Exception as e:
+        return {'url': url, 'row': None, 'error': f"{type(e).__name__}: {e}"}
+
+
+def scrape_products(urls, output_path, options, processes=None, log=print):
+    """Scrape bare product URLs across processes into one output, in input order.
+
+    Returns the list of (url, error) for pages that failed; their rows are
+    left out of the output. Product pages do not name their category (it
+    comes from the listing), so the category column is not exported.
+    """
+    columns = merged_columns(profiles_for(urls, options.get('profile')), skip_fields=('category',))
+
+    failed = []
+    with open_sink(output_path, columns=columns) as sink:
+        results = run_sharded(scrape_product, urls, processes, initializer=init_product_worker, initargs=(options,))
+        for done, result in enumerate(results, start=1):
+            if result['error']:
+                failed.append((result['url'], result['error']))
+                log(f"❌ {result['url']}: {result['error']}")
+            else:
+                sink.write({column: result['row'].get(column, '') for column in columns})
+            if done % 100 == 0:
+                log(f"{done}/{len(urls)} product pages done")
+    return failed
@@ -1,79 +1,112 @@
-import os
 import sys
-import time
-import pandas as pd
-import re
 from datetime import datetime
 
 from PyQt6.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QLineEdit, QPushButton, QTextEdit, QLabel,
-    QProgressBar, QGridLayout, QMessageBox, QComboBox, QHBoxLayout
+    QApplication, QWidget, QVBoxLayout, QLineEdit, QPushButton, QLabel,
+    QProgressBar, QGridLayout, QMessageBox, QComboBox, QHBoxLayout, QCheckBox
 )
-from PyQt6.QtCore import QThread, pyqtSignal, Qt
+from PyQt6.QtCore import Qt
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from scraper_core.browser_pool import get_pool
+from scraper_core.engine import records_from_tree
+from scraper_core.export import open_sink
+from scraper_core.instrument import recording, span, timings_from_env, timings_path_for
+from scraper_core.js_extract import extract_json, records_from_json, spec_from_selectors
+from scraper_core.parsing import Node, make_soup
+from scraper_core.qt_worker import LogView, ScrapeWorker, format_stats
+from scraper_core.response_cache import CacheMiss, ResponseCache, cached_render
 
 
 # ✅ Scraper Worker Thread
-class ScraperThread(QThread):
-    progress_signal = pyqtSignal(int)
-    log_signal = pyqtSignal(str)
-    finished_signal = pyqtSignal(str)
-
-    def __init__(self, url, selectors):
+class ScraperThread(ScrapeWorker):
+    def __init__(self, url, selectors, cache=None, in_browser=True):
         super().__init__()
         self.url = url
         self.selectors = selectors
+        self.cache = cache
+        self.in_browser = in_browser
         self.chromedriver_path = r'C:\Windows\chromedriver\chromedriver.exe'
+        # Warm browsers are shared by every run started from this window
+        self.browser_pool = get_pool(self.chromedriver_path)
 
-    def run(self):
-        self.log_signal.emit("Initializing browser...")
-
-        options = webdriver.ChromeOptions()
-        options.add_argument("--start-maximized")
-        options.page_load_strategy = 'eager'
-
-        driver = webdriver.Chrome(service=Service(self.chromedriver_path), options=options)
-        driver.get(self.url)
-        wait = WebDriverWait(driver, 10)
-
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-        # ✅ Extract Products
-        product_items = soup.find_all(self.selectors["products_tag"], class_=self.selectors["products_class"])
-        products_data = []
-        total_products = len(product_items)
-        self.log_signal.emit(f"Found {total_products} products.")
-
-        for i, product in enumerate(product_items):
-            title_tag = product.find(self.selectors["title_tag"], class_=self.selectors["title_class"])
-            link_tag = title_tag.find('a') if title_tag else None
+    def scrape(self):
+        self.log("Initializing browser...")
 
-            product_link = link_tag['href'] if link_tag and link_tag.has_attr('href') else 'No link'
-            title = link_tag.get_text(strip=True) if link_tag else 'No title'
-            price_tag = product.find(self.selectors["price_tag"], class_=self.selectors["price_class"])
-            price = price_tag.text.strip() if price_tag else 'No price'
-
-            products_data.append({
-                'Name': title,
-                'Price': price,
-                'Link': product_link,
-            })
-
-            self.progress_signal.emit(int((i + 1) / total_products * 100))
-
-        driver.quit()
-
-        # ✅ Export Data
-        df = pd.DataFrame(products_data)
+        # ✅ Rows are written as they are extracted and the file is moved into place at the end
         filename = f"product_list_{datetime.now().strftime('%Y-%m-%d')}.csv"
-        df.to_csv(filename, index=False)
-        self.finished_signal.emit(f"✅ Data saved as {filename}")
+        # ✅ SCRAPER_TIMINGS=1 writes per-stage timings next to the CSV
+        timings_path = timings_path_for(filename) if timings_from_env() else None
+        mode = 'in_browser' if self.in_browser else 'page_source'
+        with recording(timings_path, url=self.url, mode=mode):
+            sink = open_sink(filename, columns=['Name', 'Price', 'Link'])
+            try:
+                if self.in_browser:
+                    self.extract_in_browser(sink)
+                else:
+                    self.extract_from_source(sink)
+            except CacheMiss:
+                sink.abort()
+                return f"❌ {self.url} is not in the cache (offline replay mode)."
+            except Exception:
+                sink.abort()
+                raise
+
+            # ✅ Export Data
+            with span('export.close'):
+                sink.close()
+        if timings_path:
+            self.log(f"Stage timings -> {timings_path}")
+        return f"✅ Data saved as {filename}"
+
+    def extract_in_browser(self, sink):
+        # One execute_script call returns every card as a compact JSON array,
+        # instead of shipping the whole DOM over WebDriver and parsing it here
+        spec = spec_from_selectors(self.selectors)
+        with span('browser.render'):
+            payload = cached_render(self.url, self.cache, lambda url: self.render(url, spec), variant=spec.cache_variant())
+        with span('parse.records'):
+            products_data = records_from_json(payload, spec)
+        self.log(f"Found {len(products_data)} products ({len(payload) // 1024} KB from the browser).")
+
+        for product in products_data:
+            product['Name'] = product['Name'] or 'No title'
+            product['Price'] = product['Price'] or 'No price'
+            product['Link'] = product['Link'] or 'No link'
+            with span('export.write'):
+                sink.write(product)
+        self.report_progress(len(products_data), len(products_data))
+
+    def extract_from_source(self, sink):
+        with span('browser.render'):
+            page_source = cached_render(self.url, self.cache, self.render)
+
+        soup = make_soup(page_source)
+
+        # ✅ Extract Products (same compiled selectors as the in-browser extraction)
+        with span('parse.records'):
+            products_data = records_from_tree(Node(soup), spec_from_selectors(self.selectors))
+        total_products = len(products_data)
+        self.log(f"Found {total_products} products.")
+
+        for i, product in enumerate(products_data):
+            with span('export.write'):
+                sink.write({
+                    'Name': product['Name'] or 'No title',
+                    'Price': product['Price'] or 'No price',
+                    'Link': product['Link'] or 'No link',
+                })
+            # Coalesced by the worker: the GUI hears about it a few times a second, not per product
+            self.report_progress(i + 1, total_products)
+
+    def render(self, url, spec=None):
+        with self.browser_pool.lease() as driver:
+            with span('browser.navigate'):
+                driver.get(url)
+            if spec is not None:
+                with span('browser.extract_json'):
+                    return extract_json(driver, spec)
+            with span('browser.page_source'):
+                return driver.page_source
 
 
 # ✅ GUI Application
@@ -130,6 +163,23 @@ class ScraperApp(QWidget):
 
         layout.addLayout(grid_layout)
 
+        # ✅ Extraction mode
+        mode_layout = QHBoxLayout()
+        mode_layout.addWidget(QLabel("Extraction:"))
+        self.mode_dropdown = QComboBox(self)
+        self.mode_dropdown.addItems(["In browser (JavaScript)", "Page source (BeautifulSoup)"])
+        mode_layout.addWidget(self.mode_dropdown)
+        layout.addLayout(mode_layout)
+
+        # ✅ Response cache, handy while tuning selectors against the same pages
+        cache_layout = QHBoxLayout()
+        self.cache_checkbox = QCheckBox("Use page cache", self)
+        self.cache_checkbox.setChecked(True)
+        self.replay_checkbox = QCheckBox("Offline (replay cache only)", self)
+        cache_layout.addWidget(self.cache_checkbox)
+        cache_layout.addWidget(self.replay_checkbox)
+        layout.addLayout(cache_layout)
+
         self.scrape_button = QPushButton("Start Scraping", self)
         self.scrape_button.clicked.connect(self.start_scraping)
         layout.addWidget(self.scrape_button)
@@ -137,9 +187,11 @@ class ScraperApp(QWidget):
         self.progress_bar = QProgressBar(self)
         self.progress_bar.setValue(0)
         layout.addWidget(self.progress_bar)
+        self.stats_label = QLabel("", self)
+        layout.addWidget(self.stats_label)
 
-        self.log_output = QTextEdit(self)
-        self.log_output.setReadOnly(True)
+        # ✅ Batched log with bounded scrollback
+        self.log_output = LogView(self, max_lines=5000)
         layout.addWidget(self.log_output)
 
         # ✅ Footer Label
@@ -163,9 +215,15 @@ class ScraperApp(QWidget):
         url = self.url_input.text().strip()
         selectors = {key: self.fields[key].currentText().strip() if "tag" in key else self.fields[key].text().strip() for key in self.fields}
 
-        self.scraper_thread = ScraperThread(url, selectors)
-        self.scraper_thread.log_signal.connect(self.log_output.append)
+        cache = None
+        if self.cache_checkbox.isChecked() or self.replay_checkbox.isChecked():
+            cache = ResponseCache(replay_only=self.replay_checkbox.isChecked())
+
+        in_browser = self.mode_dropdown.currentIndex() == 0
+        self.scraper_thread = ScraperThread(url, selectors, cache, in_browser)
+        self.scraper_thread.log_signal.connect(self.log_output.append_lines)
         self.scraper_thread.progress_signal.connect(self.progress_bar.setValue)
+        self.scraper_thread.stats_signal.connect(lambda stats: self.stats_label.setText(format_stats(stats)))
         self.scraper_thread.finished_signal.connect(lambda msg: self.log_output.append(msg))
         self.scraper_thread.start()
 
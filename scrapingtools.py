@@ -1,141 +1,50 @@
 import os
 import sys
-import time
-import random
-import string
-import pandas as pd
-import re
 from datetime import datetime
 
-from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLineEdit, QPushButton, QTextEdit, QLabel, QProgressBar
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QLabel, QProgressBar, QSpinBox
 from PyQt6.QtGui import QIcon
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.webdriver import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 
+from scraper_core.engine import CategoryScraper
+from scraper_core.profiles import LAPTOPENGINE, profile_for_url
+from scraper_core.qt_worker import LogView, ScrapeWorker, format_stats
 
 # ✅ Scraper Worker Thread (Runs in Background)
-class ScraperThread(QThread):
-    progress_signal = pyqtSignal(int)
-    log_signal = pyqtSignal(str)
-    finished_signal = pyqtSignal(str)
-
-    def __init__(self, url):
+class ScraperThread(ScrapeWorker):
+    def __init__(self, url, concurrency=4, max_per_host=2, min_interval=0.5, resume=False):
         super().__init__()
         self.url = url
+        self.resume = resume
         self.chromedriver_path = r'C:\Windows\chromedriver\chromedriver.exe'
-
-    def run(self):
-        self.log_signal.emit("Initializing browser...")
-        
-        options = webdriver.ChromeOptions()
-        options.add_argument("--start-maximized")
-        options.page_load_strategy = 'eager'
-
-        driver = webdriver.Chrome(service=Service(self.chromedriver_path), options=options)
-        driver.get(self.url)
-        wait = WebDriverWait(driver, 10)
-
-        # ✅ Load all products by clicking "Load More"
-        def load_all_products():
-            while True:
-                try:
-                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
-                    load_more_button = wait.until(EC.element_to_be_clickable((By.CLASS_NAME, "electron-load-more")))
-                    driver.execute_script("arguments[0].click();", load_more_button)
-                    self.log_signal.emit("Clicked 'Load More'...")
-                    time.sleep(5)
-                except Exception:
-                    self.log_signal.emit("All products loaded.")
-                    break
-
-        load_all_products()
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-        # ✅ Extract Category
-        category_tag = soup.find('h2')
-        category = category_tag.get_text(separator=" ", strip=True) if category_tag else 'No category'
-
-        # ✅ Extract Products
-        product_items = soup.find_all('div', class_='electron-loop-product')
-        products_data = []
-        total_products = len(product_items)
-        self.log_signal.emit(f"Found {total_products} products.")
-
-        def normalize_image_url(url):
-            if url.startswith('//'):
-                return f'https:{url}'
-            elif url.startswith('http://'):
-                return url.replace('http://', 'https://')
-            elif not url.startswith(('http://', 'https://')):
-                return f'https://{url}'
-            return url
-
-        def is_valid_image_url(url):
-            return bool(re.match(r'^(https?://)', url))
-
-        for i, product in enumerate(product_items):
-            title_tag = product.find('h6', class_='product-name')
-            link_tag = title_tag.find('a') if title_tag else None
-
-            product_link = link_tag['href'] if link_tag and link_tag.has_attr('href') else 'No link'
-            title = link_tag.get_text(strip=True) if link_tag else 'No title'
-            price_tag = product.find('span', class_='price-item--sale')
-            price = price_tag.text.strip() if price_tag else 'No price'
-
-            if product_link.startswith("/"):
-                product_link = f"https://www.laptopengine.com{product_link}"
-            elif not product_link.startswith("http"):
-                product_link = "No link available"
-
-            if product_link != 'No link available':
-                try:
-                    driver.set_page_load_timeout(10)
-                    driver.get(product_link)
-                    time.sleep(2)
-                    product_soup = BeautifulSoup(driver.page_source, 'html.parser')
-                    slider_images = []
-                    slider_divs = product_soup.find_all('div', class_='swiper-slide')
-                    for slider_div in slider_divs:
-                        img_tag = slider_div.find('img')
-                        if img_tag and img_tag.has_attr('src'):
-                            image_url = img_tag['src']
-                            if is_valid_image_url(image_url):
-                                slider_images.append(normalize_image_url(image_url))
-                    desc_tag = product_soup.find('div', class_='product-desc-content')
-                    description = desc_tag.get_text(separator="\n", strip=True) if desc_tag else 'No description'
-                except Exception:
-                    slider_images = ['No image']
-                    description = 'No description'
-
-            else:
-                slider_images = ['No image']
-                description = 'No description'
-
-            products_data.append({
-                'Category': category,
-                'Name': title,
-                'Images': ", ".join(slider_images),
-                'Description': description,
-                'Scraped': 'Yes',
-            })
-
-            self.progress_signal.emit(int((i + 1) / total_products * 100))
-
-        driver.quit()
-
-        # ✅ Export Data
-        df = pd.DataFrame(products_data)
-        filename = f"product_list_{datetime.now().strftime('%Y-%m-%d')}.csv"
-        df.to_csv(filename, index=False)
-        self.finished_signal.emit(f"✅ Data saved as {filename}")
+        self.concurrency = concurrency
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+
+    def scrape(self):
+        self.log("Initializing browser...")
+
+        # Sites without a profile of their own are assumed to use the laptopengine shop theme
+        try:
+            profile = profile_for_url(self.url)
+        except ValueError:
+            profile = LAPTOPENGINE
+
+        # ✅ Same engine as the command line: streaming, checkpointed, one output per category
+        scraper = CategoryScraper(
+            self.url, profile,
+            output_path=f"product_list_{datetime.now().strftime('%Y-%m-%d')}.csv",
+            concurrency=self.concurrency,
+            resume=self.resume,
+            chromedriver_path=self.chromedriver_path,
+            max_per_host=self.max_per_host,
+            min_interval=self.min_interval,
+            log=self.log,
+            progress=self.report_progress,
+            control=self.control,
+        )
+        # A cancelled run is checkpointed, Resume picks it up again
+        filename = scraper.run()
+        return f"✅ Data saved as {filename}"
 
 
 # ✅ GUI Application
@@ -161,33 +70,79 @@ class ScraperApp(QWidget):
         self.url_input.setPlaceholderText("Enter website URL...")
         layout.addWidget(self.url_input)
 
+        concurrency_row = QHBoxLayout()
+        concurrency_row.addWidget(QLabel("Parallel browsers:"))
+        self.concurrency_input = QSpinBox(self)
+        self.concurrency_input.setRange(1, 16)
+        self.concurrency_input.setValue(4)
+        concurrency_row.addWidget(self.concurrency_input)
+        concurrency_row.addStretch()
+        layout.addLayout(concurrency_row)
+
+        button_row = QHBoxLayout()
         self.scrape_button = QPushButton("Start Scraping", self)
         self.scrape_button.clicked.connect(self.start_scraping)
-        layout.addWidget(self.scrape_button)
+        button_row.addWidget(self.scrape_button)
+        self.resume_button = QPushButton("Resume", self)
+        self.resume_button.setToolTip("Continue the last unfinished scrape of this URL")
+        self.resume_button.clicked.connect(lambda: self.start_scraping(resume=True))
+        button_row.addWidget(self.resume_button)
+        self.pause_button = QPushButton("Pause", self)
+        self.pause_button.setEnabled(False)
+        button_row.addWidget(self.pause_button)
+        self.stop_button = QPushButton("Stop", self)
+        self.stop_button.setToolTip("Stop now; Resume continues from here")
+        self.stop_button.setEnabled(False)
+        button_row.addWidget(self.stop_button)
+        layout.addLayout(button_row)
 
         self.progress_bar = QProgressBar(self)
         self.progress_bar.setValue(0)
         layout.addWidget(self.progress_bar)
+        self.stats_label = QLabel("", self)
+        layout.addWidget(self.stats_label)
 
-        self.log_output = QTextEdit(self)
-        self.log_output.setReadOnly(True)
+        # ✅ Log lines arrive in batches, a few times a second; only the last 5000 are kept
+        self.log_output = LogView(self, max_lines=5000)
         layout.addWidget(self.log_output)
 
         self.setLayout(layout)
 
-    def start_scraping(self):
+    def start_scraping(self, resume=False):
         url = self.url_input.text().strip()
         if not url:
             self.log_output.append("❌ Please enter a valid URL.")
             return
 
-        self.log_output.append(f"🔍 Scraping: {url}")
-        self.scraper_thread = ScraperThread(url)
+        self.log_output.append(f"🔍 {'Resuming' if resume else 'Scraping'}: {url}")
+        self.scraper_thread = ScraperThread(url, concurrency=self.concurrency_input.value(), resume=resume)
         self.scraper_thread.progress_signal.connect(self.progress_bar.setValue)
-        self.scraper_thread.log_signal.connect(self.log_output.append)
-        self.scraper_thread.finished_signal.connect(lambda msg: self.log_output.append(msg))
+        self.scraper_thread.stats_signal.connect(lambda stats: self.stats_label.setText(format_stats(stats)))
+        self.scraper_thread.log_signal.connect(self.log_output.append_lines)
+        self.scraper_thread.paused_signal.connect(self.scraping_paused)
+        self.scraper_thread.finished_signal.connect(self.scraping_finished)
+        self.pause_button.clicked.connect(self.scraper_thread.toggle_pause)
+        self.stop_button.clicked.connect(self.scraper_thread.cancel)
+        self.set_running(True)
         self.scraper_thread.start()
 
+    def set_running(self, running):
+        self.scrape_button.setEnabled(not running)
+        self.resume_button.setEnabled(not running)
+        self.pause_button.setEnabled(running)
+        self.stop_button.setEnabled(running)
+        self.pause_button.setText("Pause")
+
+    def scraping_paused(self, paused):
+        self.pause_button.setText("Continue" if paused else "Pause")
+        self.log_output.append("⏸ Paused." if paused else "▶️ Continuing...")
+
+    def scraping_finished(self, message):
+        self.pause_button.clicked.disconnect()
+        self.stop_button.clicked.disconnect()
+        self.set_running(False)
+        self.log_output.append(message)
+
 
 # ✅ Run Application
 if __name__ == "__main__":
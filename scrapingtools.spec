@@ -5,7 +5,7 @@ a = Analysis(
     ['scrapingtools.py'],
     pathex=[],
     binaries=[],
-    datas=[('icon.png', '.')],
+    datas=[('icon.png', '.'), ('scraper_core/profiles/*.json', 'scraper_core/profiles')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -1,16 +1,8 @@
 import sys
-import random
-import string
-import time
-from datetime import datetime
-import pandas as pd
-from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QLabel, QTextEdit, QFileDialog, QTableWidget, QTableWidgetItem
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFileDialog, QLineEdit
+
+from scraper_core.qt_listing import LoadMoreWorker
+from scraper_core.qt_table import RecordFilterProxy, RecordTableModel, connect_search, make_record_view
 
 import os
 from PIL import Image
@@ -31,6 +23,7 @@ except FileNotFoundError:
 # ChromeDriver Path
 chromedriver_path = r'C:\Windows\chromedriver\chromedriver.exe'
 
+
 class ScraperApp(QWidget):
     def __init__(self):
         super().__init__()
@@ -44,11 +37,28 @@ class ScraperApp(QWidget):
         self.status_label = QLabel("Status: Ready")
         layout.addWidget(self.status_label)
         
+        button_row = QHBoxLayout()
         self.start_button = QPushButton("Start Scraping")
         self.start_button.clicked.connect(self.start_scraping)
-        layout.addWidget(self.start_button)
+        button_row.addWidget(self.start_button)
+        self.pause_button = QPushButton("Pause")
+        self.pause_button.setEnabled(False)
+        button_row.addWidget(self.pause_button)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        button_row.addWidget(self.cancel_button)
+        layout.addLayout(button_row)
         
-        self.result_table = QTableWidget()
+        # ✅ Results: a model over column data, only the visible cells are ever rendered
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Filter results...")
+        layout.addWidget(self.search_input)
+
+        self.table_model = RecordTableModel(LoadMoreWorker.columns, self)
+        self.table_proxy = RecordFilterProxy(self)
+        self.table_proxy.setSourceModel(self.table_model)
+        connect_search(self.search_input, self.table_proxy)
+        self.result_table = make_record_view(self.table_proxy, self)
         layout.addWidget(self.result_table)
         
         self.export_button = QPushButton("Export CSV")
@@ -57,69 +67,53 @@ class ScraperApp(QWidget):
         layout.addWidget(self.export_button)
         
         self.setLayout(layout)
-        self.products_data = []
 
     def start_scraping(self):
         self.status_label.setText("Status: Scraping started...")
-        
-        options = webdriver.ChromeOptions()
-        options.add_argument("--start-maximized")
-        options.page_load_strategy = 'eager'
-        driver = webdriver.Chrome(service=Service(chromedriver_path), options=options)
-        
+        self.table_model.clear()
+
         url = "https://www.laptopengine.com/product-category/laptops-laptops-computers/"
-        driver.get(url)
-        wait = WebDriverWait(driver, 10)
-        
-        def load_all_products():
-            while True:
-                try:
-                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
-                    load_more_button = wait.until(EC.element_to_be_clickable((By.CLASS_NAME, "electron-load-more")))
-                    driver.execute_script("arguments[0].click();", load_more_button)
-                    time.sleep(5)
-                except Exception:
-                    break
-        
-        load_all_products()
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        category_tag = soup.find('h2')
-        category = category_tag.get_text(strip=True) if category_tag else 'No category'
-        product_items = soup.find_all('div', class_='electron-loop-product')
-        
-        self.products_data = []
-        for product in product_items:
-            title_tag = product.find('h6', class_='product-name')
-            link_tag = title_tag.find('a') if title_tag else None
-            product_link = link_tag['href'] if link_tag and link_tag.has_attr('href') else 'No link'
-            title = link_tag.get_text(strip=True) if link_tag else 'No title'
-            price_tag = product.find('span', class_='price-item--sale')
-            price = price_tag.text.strip() if price_tag else 'No price'
-            
-            self.products_data.append([category, title, price, product_link])
-        
-        driver.quit()
-        
-        self.populate_table()
-        self.status_label.setText("Status: Scraping completed!")
-        self.export_button.setEnabled(True)
-        
-    def populate_table(self):
-        self.result_table.setColumnCount(4)
-        self.result_table.setRowCount(len(self.products_data))
-        self.result_table.setHorizontalHeaderLabels(["Category", "Title", "Price", "Link"])
-        
-        for row, data in enumerate(self.products_data):
-            for col, value in enumerate(data):
-                self.result_table.setItem(row, col, QTableWidgetItem(value))
-        
+        self.scraper_thread = LoadMoreWorker(url, chromedriver_path)
+        self.scraper_thread.rows_signal.connect(self.table_model.append_rows)
+        self.scraper_thread.log_signal.connect(lambda lines: self.status_label.setText(f"Status: {lines[-1]}"))
+        self.scraper_thread.paused_signal.connect(self.scraping_paused)
+        self.scraper_thread.finished_signal.connect(self.scraping_finished)
+        self.pause_button.clicked.connect(self.scraper_thread.toggle_pause)
+        self.cancel_button.clicked.connect(self.scraper_thread.cancel)
+
+        self.start_button.setEnabled(False)
+        self.pause_button.setEnabled(True)
+        self.cancel_button.setEnabled(True)
+        self.export_button.setEnabled(False)
+        self.scraper_thread.start()
+
+    def scraping_paused(self, paused):
+        self.pause_button.setText("Resume" if paused else "Pause")
+        self.status_label.setText("Status: Paused" if paused else "Status: Scraping...")
+
+    def scraping_finished(self, message):
+        self.pause_button.clicked.disconnect()
+        self.cancel_button.clicked.disconnect()
+        self.pause_button.setText("Pause")
+        self.pause_button.setEnabled(False)
+        self.cancel_button.setEnabled(False)
+        self.start_button.setEnabled(True)
+        self.export_button.setEnabled(self.table_model.rowCount() > 0)
+        self.status_label.setText(f"Status: {message}")
+
     def export_csv(self):
         filename, _ = QFileDialog.getSaveFileName(self, "Save CSV", "", "CSV Files (*.csv)")
-        if filename:
-            df = pd.DataFrame(self.products_data, columns=["Category", "Title", "Price", "Link"])
-            df.to_csv(filename, index=False)
-            self.status_label.setText(f"Status: Data exported to {filename}")
+        if not filename:
+            return
+        # Streamed straight from the table's column data: the rows the filter shows, in the order shown
+        try:
+            filename = self.table_proxy.export(filename)
+        except (ValueError, OSError) as e:
+            self.status_label.setText(f"Status: Export failed: {e}")
+            return
+        shown, total = self.table_proxy.rowCount(), self.table_model.rowCount()
+        rows = f"{shown} rows" if shown == total else f"{shown} of {total} rows (filtered)"
+        self.status_label.setText(f"Status: {rows} exported to {filename}")
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
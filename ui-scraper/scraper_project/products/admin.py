@@ -1,8 +1,9 @@
 from django.contrib import admin
-from .models import Product
+from .models import Product, ScrapeJob
 
 
 admin.site.register(Product)
+admin.site.register(ScrapeJob)
 
 
 # @admin.register(Product)
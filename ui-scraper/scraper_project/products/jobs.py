@@ -0,0 +1,74 @@
+import asyncio
+import traceback
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Product, ScrapeJob
+from .persistence import save_products
+from .scraper import ascrape_revibe_products
+
+
+def job_dir(job):
+    return Path(settings.SCRAPE_JOBS_DIR) / str(job.pk)
+
+
+def enqueue_scrape():
+    return ScrapeJob.objects.create()
+
+
+def claim_next_job():
+    """Move the oldest queued job to running and return it, or None if the queue is empty.
+
+    The conditional UPDATE makes the claim atomic, so several worker
+    processes can poll the same database safely.
+    """
+    queued = ScrapeJob.objects.filter(status=ScrapeJob.QUEUED).order_by('created_at')
+    for job_id in queued.values_list('pk', flat=True)[:10]:
+        claimed = ScrapeJob.objects.filter(pk=job_id, status=ScrapeJob.QUEUED).update(
+            status=ScrapeJob.RUNNING, started_at=timezone.now()
+        )
+        if claimed:
+            return ScrapeJob.objects.get(pk=job_id)
+    return None
+
+
+def fail_stale_jobs(max_age=timedelta(hours=2)):
+    """Jobs left running by a worker that died never finish on their own."""
+    return ScrapeJob.objects.filter(
+        status=ScrapeJob.RUNNING, started_at__lt=timezone.now() - max_age
+    ).update(status=ScrapeJob.FAILED, finished_at=timezone.now(), error='Worker stopped before the job finished.')
+
+
+def run_job(job):
+    directory = job_dir(job)
+    directory.mkdir(parents=True, exist_ok=True)
+    try:
+        artifact, products_data = asyncio.run(
+            ascrape_revibe_products(output_path=str(directory / 'scraped_products.xlsx'))
+        )
+        save_products(products_data)
+    except Exception:
+        job.status = ScrapeJob.FAILED
+        job.error = traceback.format_exc()
+    else:
+        job.status = ScrapeJob.DONE
+        job.artifact_path = artifact
+        job.product_count = len(products_data)
+    job.finished_at = timezone.now()
+    job.save()
+    return job
+
+
+def latest_completed_job():
+    return ScrapeJob.objects.filter(status=ScrapeJob.DONE).order_by('-finished_at').first()
+
+
+def job_products(job):
+    """Products stored or refreshed by `job`; every product when there is no job yet."""
+    products = Product.objects.order_by('category', 'title')
+    if job is not None:
+        products = products.filter(scraped_at__gte=job.started_at)
+    return products
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from products.jobs import claim_next_job, fail_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = "Run queued scrape jobs. Start one or more of these next to the web server."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Run at most one job and exit.")
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="Seconds between queue checks.")
+
+    def handle(self, *args, **options):
+        stale = fail_stale_jobs()
+        if stale:
+            self.stdout.write(f"Marked {stale} stale job(s) as failed.")
+
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f"Running scrape job #{job.pk}...")
+            job = run_job(job)
+            if job.status == job.DONE:
+                self.stdout.write(self.style.SUCCESS(f"Job #{job.pk} finished with {job.product_count} products."))
+            else:
+                self.stdout.write(self.style.ERROR(f"Job #{job.pk} failed:\n{job.error}"))
+
+            if options['once']:
+                return
@@ -0,0 +1,61 @@
+# Brings the table created by 0001_initial in line with products/models.py:
+# the scrapers produce a category, a free-text price and a product_link, and
+# runs are upserted keyed on that link.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_scrapejob'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='product',
+            old_name='link',
+            new_name='product_link',
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='product_link',
+            field=models.URLField(max_length=500, unique=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='category',
+            field=models.CharField(blank=True, default='', max_length=255),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='price',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='image_url',
+            field=models.URLField(blank=True, default='', max_length=500),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='description',
+            field=models.TextField(blank=True, default=''),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='scraped_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category'], name='product_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['scraped_at'], name='product_scraped_at_idx'),
+        ),
+    ]
@@ -1,12 +1,46 @@
 from django.db import models
 
 class Product(models.Model):
-    category = models.CharField(max_length=255)
+    category = models.CharField(max_length=255, blank=True)
     title = models.CharField(max_length=255)
-    image_url = models.URLField(max_length=500)
-    price = models.CharField(max_length=50)
-    description = models.TextField()
-    product_link = models.URLField(max_length=500)
+    image_url = models.URLField(max_length=500, blank=True)
+    price = models.CharField(max_length=50, blank=True)
+    description = models.TextField(blank=True)
+    product_link = models.URLField(max_length=500, unique=True)
+    scraped_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['category'], name='product_category_idx'),
+            models.Index(fields=['scraped_at'], name='product_scraped_at_idx'),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class ScrapeJob(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    product_count = models.IntegerField(default=0)
+    artifact_path = models.CharField(max_length=500, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Scrape job #{self.pk} ({self.status})"
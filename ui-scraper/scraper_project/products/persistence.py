@@ -0,0 +1,44 @@
+from django.db import transaction
+
+from .models import Product
+
+
+UPSERT_FIELDS = ['category', 'title', 'image_url', 'price', 'description', 'scraped_at']
+
+
+def product_from_record(record):
+    # "No image available" and similar placeholders are not URLs; no image is stored as ''
+    image_url = record.get('Image URL', '')
+    return Product(
+        category=record.get('Category', ''),
+        title=record.get('Title', '')[:255],
+        image_url=image_url if image_url.startswith('http') else '',
+        price=str(record.get('Price', ''))[:50],
+        description=record.get('Description', ''),
+        product_link=record['Product Link'],
+    )
+
+
+def save_products(products_data, batch_size=500):
+    """Upsert one scrape run into Product, keyed on the product URL.
+
+    Rows are written with batched INSERT ... ON CONFLICT DO UPDATE inside a
+    single transaction, so a run is either stored completely or not at all.
+    Records without a usable link cannot be keyed and are skipped.
+    """
+    products = {}
+    for record in products_data:
+        link = record.get('Product Link', '')
+        if link.startswith('http'):
+            # A link listed twice would hit the same row twice in one statement
+            products[link] = product_from_record(record)
+
+    with transaction.atomic():
+        Product.objects.bulk_create(
+            list(products.values()),
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['product_link'],
+            update_fields=UPSERT_FIELDS,
+        )
+    return len(products)
@@ -1,81 +1,118 @@
-import requests
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.keys import Keys
-from bs4 import BeautifulSoup
-import pandas as pd
-import time
+import asyncio
+import logging
 import os
 
+from scraper_core.async_http import AsyncFetcher
+from scraper_core.browser_pool import DEFAULT_CHROMEDRIVER_PATH, get_pool
+from scraper_core.change_detection import ChangeTracker
+from scraper_core.engine import NO_LINK, CategoryScraper, build_row, fetch_cards, parse_detail, render_listing
+from scraper_core.export import open_sink
+from scraper_core.images import ImageStage
+from scraper_core.instrument import recording, span, timings_from_env, timings_path_for
+from scraper_core.profiles import REVIBE
 
-def scrape_revibe_products():
-    # Set up Selenium
-    chromedriver_path = r'C:\Windows\chromedriver\chromedriver.exe'
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless")  # Run in headless mode for server environments
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-
-    driver = webdriver.Chrome(service=Service(chromedriver_path), options=options)
-    url = "https://revibe.me/collections/refurbished-iphones-uae"
-    driver.get(url)
-
-    # Scroll to load all products
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    while True:
-        driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.END)
-        time.sleep(2)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            break
-        last_height = new_height
-
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
-    driver.quit()
-
-    # Extract category
-    category_tag = soup.find('h2')
-    category = category_tag.get_text(separator=" ", strip=True) if category_tag else 'No category available'
-
-    # Extract product details
-    product_items = soup.find_all('div', class_='product-item')
+
+COLLECTION_URL = "https://revibe.me/collections/refurbished-iphones-uae"
+
+logger = logging.getLogger(__name__)
+
+
+def default_output_path():
+    return os.path.join(os.getcwd(), 'scraped_products.xlsx')
+
+
+def scrape_revibe_products(output_path=None):
+    """Scrape the collection with the shared engine; returns (output_path, products_data).
+
+    With SCRAPER_TIMINGS=1 the engine writes <output>.timings.json next to the workbook.
+    """
+    products_data = []
+    scraper = CategoryScraper(
+        COLLECTION_URL, REVIBE, output_path=output_path or default_output_path(), on_row=products_data.append,
+    )
+    return scraper.run(), products_data
+
+
+async def ascrape_revibe_products(output_path=None, concurrency=8, rate=5.0, url=COLLECTION_URL, profile=REVIBE,
+                                  fetcher=None):
+    """Async version of scrape_revibe_products; product pages are fetched concurrently.
+
+    Uses the same profile parsing, image clean-up and row layout as the
+    engine, only the fetching is done with aiohttp. Rows are written to
+    `output_path` in listing order as their pages come in. Returns the same
+    (output_path, products_data) pair, so views can simply `await` it.
+    `url` and `profile` point it at another collection or a copy of the
+    shop (benchmarks/bench_scrape.py runs it against a local fixture);
+    an already open `fetcher` (AsyncFetcher) replaces the default one.
+    """
+    output_path = output_path or default_output_path()
+    timings_path = timings_path_for(output_path) if timings_from_env() else None
+    with recording(timings_path, url=url, profile=profile['name'], mode='async') as recorder:
+        if fetcher is None:
+            async with AsyncFetcher(concurrency=concurrency, rate=rate) as fetcher:
+                result = await _ascrape_revibe_products(output_path, url, profile, fetcher)
+        else:
+            result = await _ascrape_revibe_products(output_path, url, profile, fetcher)
+        if recorder.enabled:
+            recorder.meta.update(output=result[0], rows=len(result[1]))
+    return result
+
+
+async def _ascrape_revibe_products(output_path, url, profile, fetcher):
+    pool = get_pool(DEFAULT_CHROMEDRIVER_PATH, headless=True)
+    category, cards = await asyncio.to_thread(
+        fetch_cards, url, profile,
+        render=lambda listing_url: render_listing(pool, listing_url, profile['listing']['card']),
+    )
+    tracker = ChangeTracker(spec=profile['detail'])
+
+    def extract(link, status, headers, body):
+        # SQLite lookups and parsing block, so they run in a worker thread, never on the event loop
+        details = tracker.unchanged(link, status, headers, body)
+        if details is None:
+            details = parse_detail(profile, body)
+            tracker.remember(link, headers, body, details)
+        return details
+
+    async def fetch_details(link):
+        # Conditional request; unchanged pages reuse the stored details
+        conditional = await asyncio.to_thread(tracker.conditional_headers, link)
+        with span('detail.http'):
+            status, headers, body = await fetcher.get(link, headers=conditional)
+        return await asyncio.to_thread(extract, link, status, headers, body)
+
+    # Same image clean-up as the engine: best rendition, one URL per image across the run
+    images = ImageStage(base_url=profile['base_url'])
     products_data = []
+    ready = {}
 
-    for product in product_items:
-        link_tag = product.find('a', class_='card-title')
-        product_link = f"https://revibe.me{link_tag['href']}" if link_tag else 'No link available'
-        image_tag = product.find('img', class_='motion-reduce')
-        image_url = image_tag.get('data-srcset', '').split(',')[0].strip().split(' ')[0] if image_tag else 'No image available'
-        title = link_tag.text.strip() if link_tag else 'No title available'
-        price_tag = product.find('span', class_='price-item--sale')
-        price = price_tag.text.strip() if price_tag else 'No price available'
-
-        # Scrape product description from product page
-        description = "No description available"
-        if product_link != 'No link available':
+    def write_ready(sink):
+        # Rows are streamed in listing order, each as soon as every product before it is done
+        while len(products_data) in ready:
+            card = cards[len(products_data)]
+            details = ready.pop(len(products_data))
+            if isinstance(details, Exception):
+                logger.warning("Failed to retrieve details for %s: %s", card['title'], details)
+                details = {'description': "No description available"}
+            with span('images.process'):
+                card, details = images.process(card, details)
+            row = build_row(profile, category, card, details)
+            with span('export.write'):
+                sink.write(row)
+            products_data.append(row)
+
+    async def scrape_card(index, card, sink):
+        details = {'description': "No description available"}
+        if card['link'] != NO_LINK:
             try:
-                product_response = requests.get(product_link)
-                product_response.raise_for_status()
-                product_soup = BeautifulSoup(product_response.content, 'html.parser')
-                desc_tag = product_soup.find('div', id='tab-technical-specifications')
-                if desc_tag:
-                    description = desc_tag.get_text(separator="\n", strip=True)
-            except requests.exceptions.RequestException:
-                print(f"Failed to retrieve details for {title}")
-
-        products_data.append({
-            'Category': category,
-            'Title': title,
-            'Image URL': image_url,
-            'Price': price,
-            'Description': description,
-            'Product Link': product_link
-        })
-
-    # Save data to Excel
-    df = pd.DataFrame(products_data)
-    output_path = os.path.join(os.getcwd(), 'scraped_products.xlsx')
-    df.to_excel(output_path, index=False)
-    
-    return output_path, products_data
+                details = await fetch_details(card['link'])
+            except Exception as e:
+                details = e
+        ready[index] = details
+        write_ready(sink)
+
+    # Written through a temp file and renamed, so a download never sees a half-written workbook
+    with open_sink(output_path, columns=list(profile['columns'])) as sink:
+        await asyncio.gather(*(scrape_card(index, card, sink) for index, card in enumerate(cards)))
+    logger.info("Product pages changed: %s, unchanged: %s", tracker.stats['changed'], tracker.stats['unchanged'])
+    return sink.path, products_data
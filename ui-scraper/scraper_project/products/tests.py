@@ -1,3 +1,73 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+
+from .jobs import claim_next_job, enqueue_scrape, fail_stale_jobs
+from .models import Product, ScrapeJob
+from .persistence import save_products
+
+
+def record(link, **fields):
+    return dict({
+        'Category': 'Refurbished iPhones',
+        'Title': 'iPhone 13 128GB',
+        'Image URL': 'https://revibe.me/cdn/shop/files/iphone-13.jpg',
+        'Price': 'AED 1,499.00',
+        'Description': 'Excellent condition',
+        'Product Link': link,
+    }, **fields)
+
+
+class SaveProductsTests(TestCase):
+    def test_same_link_twice_updates_one_product(self):
+        link = 'https://revibe.me/products/iphone-13'
+        save_products([record(link)])
+        save_products([record(link, Title='iPhone 13 256GB', Price='AED 1,699.00')])
+
+        self.assertEqual(Product.objects.count(), 1)
+        product = Product.objects.get(product_link=link)
+        self.assertEqual(product.title, 'iPhone 13 256GB')
+        self.assertEqual(product.price, 'AED 1,699.00')
+
+    def test_duplicate_link_in_one_run(self):
+        link = 'https://revibe.me/products/iphone-13'
+        self.assertEqual(save_products([record(link), record(link, Title='iPhone 13 256GB')]), 1)
+        self.assertEqual(Product.objects.get().title, 'iPhone 13 256GB')
+
+    def test_records_without_link_are_skipped(self):
+        self.assertEqual(save_products([record('No link available')]), 0)
+        self.assertFalse(Product.objects.exists())
+
+    def test_image_placeholder_is_stored_empty(self):
+        save_products([record('https://revibe.me/products/iphone-13', **{'Image URL': 'No image available'})])
+        self.assertEqual(Product.objects.get().image_url, '')
+
+
+class ClaimNextJobTests(TestCase):
+    def test_claims_oldest_queued_job(self):
+        first = enqueue_scrape()
+        second = enqueue_scrape()
+        ScrapeJob.objects.filter(pk=first.pk).update(created_at=timezone.now() - timedelta(minutes=1))
+
+        job = claim_next_job()
+        self.assertEqual(job.pk, first.pk)
+        self.assertEqual(job.status, ScrapeJob.RUNNING)
+        self.assertIsNotNone(job.started_at)
+        second.refresh_from_db()
+        self.assertEqual(second.status, ScrapeJob.QUEUED)
+
+    def test_job_is_claimed_once(self):
+        enqueue_scrape()
+        self.assertIsNotNone(claim_next_job())
+        self.assertIsNone(claim_next_job())
+
+    def test_stale_running_job_fails(self):
+        enqueue_scrape()
+        job = claim_next_job()
+        ScrapeJob.objects.filter(pk=job.pk).update(started_at=timezone.now() - timedelta(hours=3))
 
-# Create your tests here.
+        self.assertEqual(fail_stale_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ScrapeJob.FAILED)
+        self.assertIsNotNone(job.finished_at)
@@ -4,4 +4,7 @@ from . import views
 urlpatterns = [
     path('scrape/', views.scrape_products, name='scrape_products'),
     path('download/', views.download_excel, name='download_excel'),
+    path('jobs/', views.create_job, name='create_job'),
+    path('jobs/<int:job_id>/', views.job_status, name='job_status'),
+    path('jobs/<int:job_id>/result/', views.job_result, name='job_result'),
 ]
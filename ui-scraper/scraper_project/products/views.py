@@ -1,18 +1,67 @@
-from django.shortcuts import render
-from django.http import HttpResponse, FileResponse
-from .scraper import scrape_revibe_products
+from django.shortcuts import render, get_object_or_404
+from django.http import FileResponse, Http404, JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import require_GET, require_POST
 
+from .jobs import enqueue_scrape, job_products, latest_completed_job
+from .models import ScrapeJob
 
+
+def job_payload(job):
+    payload = {
+        'id': job.pk,
+        'status': job.status,
+        'created_at': job.created_at.isoformat(),
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'product_count': job.product_count,
+        'status_url': reverse('job_status', args=[job.pk]),
+    }
+    if job.status == ScrapeJob.DONE:
+        payload['result_url'] = reverse('job_result', args=[job.pk])
+    if job.status == ScrapeJob.FAILED:
+        payload['error'] = job.error
+    return payload
+
+
+def artifact_response(job):
+    try:
+        return FileResponse(open(job.artifact_path, 'rb'), as_attachment=True, filename='scraped_products.xlsx')
+    except OSError:
+        raise Http404("The result file for this job is no longer available.")
+
+
+@require_GET
 def scrape_products(request):
-    file_path, products_data = scrape_revibe_products()
-    
+    job = latest_completed_job()
     context = {
-        'products': products_data,
-        'file_path': file_path
+        'products': job_products(job),
+        'job': job,
+        'pending_job': ScrapeJob.objects.filter(status__in=[ScrapeJob.QUEUED, ScrapeJob.RUNNING]).first(),
     }
     return render(request, 'products/products_list.html', context)
 
 
+@require_GET
 def download_excel(request):
-    file_path, _ = scrape_revibe_products()
-    return FileResponse(open(file_path, 'rb'), as_attachment=True, filename='scraped_products.xlsx')
+    job = latest_completed_job()
+    if job is None:
+        raise Http404("No scrape has finished yet.")
+    return artifact_response(job)
+
+
+@require_POST
+def create_job(request):
+    job = enqueue_scrape()
+    return JsonResponse(job_payload(job), status=202)
+
+
+@require_GET
+def job_status(request, job_id):
+    return JsonResponse(job_payload(get_object_or_404(ScrapeJob, pk=job_id)))
+
+
+@require_GET
+def job_result(request, job_id):
+    job = get_object_or_404(ScrapeJob, pk=job_id, status=ScrapeJob.DONE)
+    return artifact_response(job)